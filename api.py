@@ -1,14 +1,159 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, g, request, stream_with_context
 import random
 import string
 import logging
-import pycountry
-from collections import defaultdict
+import logging.handlers
+import queue
+import copy
+import time
+import math
+import atexit
+import shutil
+import hashlib
+import functools
+import json
+import os
+import threading
+import operator
+import bisect
+import sqlite3
+import multiprocessing
+from array import array
+from collections import Counter, OrderedDict, defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from country_names import COUNTRY_NAMES as EMBEDDED_COUNTRY_NAMES
 
 app = Flask(__name__)
 
-logging.basicConfig(level=logging.DEBUG)
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO").upper()
+ACCESS_LOG_SAMPLE_RATE = min(max(float(os.environ.get("ACCESS_LOG_SAMPLE_RATE", "1")), 0.0), 1.0)
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage()
+        }
+        entry.update(getattr(record, "fields", {}))
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, separators=(",", ":"), default=str)
+
+class StructuredQueueHandler(logging.handlers.QueueHandler):
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+def configure_logging(level: str = LOG_LEVEL):
+    handler = logging.StreamHandler()
+    handler.setFormatter(JsonFormatter())
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, handler, respect_handler_level=True)
+    root = logging.getLogger()
+    root.handlers[:] = [StructuredQueueHandler(log_queue)]
+    root.setLevel(level)
+    logging.getLogger("werkzeug").setLevel(max(root.level, logging.WARNING))
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
+
+configure_logging()
 logger = logging.getLogger(__name__)
+access_logger = logging.getLogger(f"{__name__}.access")
+
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+METRIC_HELP = {
+    "iban_http_requests_total": ("counter", "HTTP requests by endpoint, country and status."),
+    "iban_http_request_duration_seconds": ("histogram", "Time to first response byte by endpoint and country."),
+    "iban_generated_total": ("counter", "IBANs generated by country."),
+    "iban_validated_total": ("counter", "IBANs validated by country and result."),
+    "iban_check_digit_seconds": ("histogram", "Check digit computation time per call."),
+    "iban_length_mismatch_total": ("counter", "Generated IBANs rejected for a length mismatch."),
+    "iban_pool_size": ("gauge", "Pre-generated IBANs waiting in the pool."),
+    "iban_pool_hits_total": ("counter", "Single requests served from the pool."),
+    "iban_pool_misses_total": ("counter", "Single requests that found the pool empty."),
+    "iban_response_cache_total": ("counter", "Deterministic response cache lookups by result."),
+    "iban_rejected_total": ("counter", "Requests rejected with 429 or 411 by reason."),
+    "iban_bulk_jobs_active": ("gauge", "Bulk jobs currently streaming in this process.")
+}
+
+LABEL_ESCAPES = str.maketrans({"\\": "\\\\", '"': '\\"', "\n": "\\n"})
+
+def escape_label(value) -> str:
+    return str(value).translate(LABEL_ESCAPES)
+
+def format_labels(labels: tuple) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{escape_label(value)}"' for name, value in labels) + "}"
+
+class Metrics:
+    def __init__(self, buckets: tuple = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self._local = threading.local()
+        self._shards = []
+        self._lock = threading.Lock()
+
+    def _shard(self):
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = (defaultdict(int), {})
+            with self._lock:
+                self._shards.append(shard)
+        return shard
+
+    def inc(self, name: str, labels: tuple = (), value: int = 1):
+        self._shard()[0][name, labels] += value
+
+    def observe(self, name: str, labels: tuple, value: float):
+        histograms = self._shard()[1]
+        histogram = histograms.get((name, labels))
+        if histogram is None:
+            histogram = histograms[name, labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        histogram[bisect.bisect_left(self.buckets, value)] += 1
+        histogram[-1] += value
+
+    def collect(self):
+        counters = defaultdict(int)
+        histograms = {}
+        with self._lock:
+            shards = list(self._shards)
+        for shard_counters, shard_histograms in shards:
+            for key, value in list(shard_counters.items()):
+                counters[key] += value
+            for key, histogram in list(shard_histograms.items()):
+                total = histograms.setdefault(key, [0] * len(histogram))
+                for index, value in enumerate(list(histogram)):
+                    total[index] += value
+        return counters, histograms
+
+    def render(self, samples: tuple = ()) -> str:
+        counters, histograms = self.collect()
+        series = defaultdict(list)
+        for (name, labels), value in sorted(counters.items(), key=str):
+            series[name].append(f"{name}{format_labels(labels)} {value}")
+        for (name, labels), histogram in sorted(histograms.items(), key=str):
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), histogram):
+                cumulative += count
+                series[name].append(f"{name}_bucket{format_labels(labels + (('le', bound),))} {cumulative}")
+            series[name].append(f"{name}_sum{format_labels(labels)} {histogram[-1]}")
+            series[name].append(f"{name}_count{format_labels(labels)} {cumulative}")
+        for name, labels, value in samples:
+            series[name].append(f"{name}{format_labels(labels)} {value}")
+        lines = []
+        for name in sorted(series):
+            kind, description = METRIC_HELP.get(name, ("untyped", name))
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.extend(series[name])
+        return "\n".join(lines) + "\n"
+
+METRICS = Metrics()
 
 country_data = {
     "AL": {"length": 28, "bank_code_length": 8, "account_length": 16},
@@ -60,7 +205,7 @@ country_data = {
     "NO": {"length": 15, "bank_code_length": 4, "account_length": 6, "check_digit_length": 1},
     "PK": {"length": 24, "bank_codes": ["SCBL", "HABB"], "account_length": 16},
     "PL": {"length": 28, "bank_code_length": 8, "account_length": 16},
-    "PT": {"length": 25, "bank_code_length": 4, "branch_code_length": 4, "account_length": 13},
+    "PT": {"length": 25, "bank_code_length": 4, "branch_code_length": 4, "account_length": 11, "check_digits_length": 2},
     "QA": {"length": 29, "bank_codes": ["QNBA", "DOHB"], "account_length": 21},
     "MD": {"length": 24, "bank_codes": ["AG", "VI"], "account_length": 18},
     "RO": {"length": 24, "bank_codes": ["AAAA", "BRDE"], "account_length": 16},
@@ -68,11 +213,11 @@ country_data = {
     "SA": {"length": 24, "bank_code_length": 2, "account_length": 18},
     "RS": {"length": 22, "bank_code_length": 3, "account_length": 13, "check_digits_length": 2},
     "SK": {"length": 24, "bank_code_length": 4, "prefix_length": 6, "account_length": 10},
-    "SI": {"length": 19, "bank_code_length": 5, "branch_code_length": 3, "account_length": 8, "check_digits_length": 2},
+    "SI": {"length": 19, "bank_code_length": 2, "branch_code_length": 3, "account_length": 8, "check_digits_length": 2},
     "ES": {"length": 24, "bank_code_length": 4, "branch_code_length": 4, "check_digits_length": 2, "account_length": 10},
     "SE": {"length": 24, "bank_code_length": 3, "account_length": 16, "check_digit_length": 1},
     "CH": {"length": 21, "bank_code_length": 5, "account_length": 12},
-    "TL": {"length": 23, "bank_code_length": 3, "account_length": 16, "check_digits_length": 2},
+    "TL": {"length": 23, "bank_code_length": 3, "account_length": 14, "check_digits_length": 2},
     "TR": {"length": 26, "bank_code_length": 5, "reserved_length": 1, "account_length": 16},
     "UA": {"length": 29, "bank_code_length": 6, "account_length": 19},
     "AE": {"length": 23, "bank_code_length": 3, "account_length": 16},
@@ -81,14 +226,64 @@ country_data = {
     "VG": {"length": 24, "bank_codes": ["VPVG", "FCIB"], "account_length": 16}
 }
 
-def generate_numeric(length: int) -> str:
-    return ''.join(str(random.randint(0, 9)) for _ in range(length))
+NUMERIC = string.digits
+ALPHA = string.ascii_uppercase
+ALPHANUM = string.ascii_uppercase + string.digits
+
+FIELD_NAMES = {
+    "identification": "identification_number",
+    "check_digits": "national_check_digits",
+    "check_digit": "national_check_digit",
+    "second_check_digit": "second_national_check_digit",
+    "account": "account_number"
+}
+
+FIELD_CHARSETS = {
+    "AL": {"account_number": ALPHANUM},
+    "AD": {"account_number": ALPHANUM},
+    "AZ": {"account_number": ALPHANUM},
+    "BH": {"account_number": ALPHANUM},
+    "BR": {"account_type": ALPHA, "owner_type": ALPHANUM},
+    "CY": {"account_number": ALPHANUM},
+    "FR": {"account_number": ALPHANUM},
+    "GI": {"account_number": ALPHANUM},
+    "GR": {"account_number": ALPHANUM},
+    "GT": {"account_number": ALPHANUM},
+    "IT": {"account_number": ALPHANUM},
+    "JO": {"account_number": ALPHANUM},
+    "KZ": {"account_number": ALPHANUM},
+    "KW": {"account_number": ALPHANUM},
+    "LV": {"account_number": ALPHANUM},
+    "LB": {"account_number": ALPHANUM},
+    "LI": {"account_number": ALPHANUM},
+    "LU": {"account_number": ALPHANUM},
+    "MK": {"account_number": ALPHANUM},
+    "MT": {"account_number": ALPHANUM},
+    "MC": {"account_number": ALPHANUM},
+    "QA": {"account_number": ALPHANUM},
+    "MD": {"account_number": ALPHANUM},
+    "RO": {"account_number": ALPHANUM},
+    "SM": {"account_number": ALPHANUM},
+    "SA": {"account_number": ALPHANUM},
+    "CH": {"account_number": ALPHANUM},
+    "TR": {"account_number": ALPHANUM},
+    "UA": {"account_number": ALPHANUM}
+}
+
+def _charset_table(charset: str):
+    usable = 256 - 256 % len(charset)
+    table = bytes(ord(charset[i % len(charset)]) for i in range(256))
+    return table, bytes(range(usable, 256))
 
-def generate_alpha(length: int) -> str:
-    return ''.join(random.choice(string.ascii_uppercase) for _ in range(length))
+CHARSET_TABLES = {charset: _charset_table(charset) for charset in (NUMERIC, ALPHA, ALPHANUM)}
 
-def generate_alphanum(length: int) -> str:
-    return ''.join(random.choice(string.ascii_uppercase + string.digits) for _ in range(length))
+def random_chars(charset: str, size: int, rng=random) -> str:
+    table, rejected = CHARSET_TABLES[charset]
+    out = b""
+    while len(out) < size:
+        missing = size - len(out)
+        out += rng.randbytes(missing + missing // 8 + 16).translate(table, rejected)
+    return out[:size].decode("ascii")
 
 def letter_to_number(c: str) -> str:
     return str(ord(c.upper()) - 55) if c.isalpha() else c
@@ -103,666 +298,1515 @@ def calculate_check_digits(country: str, bban: str) -> str:
     check_digits = 98 - mod
     return f"{check_digits:02d}"
 
-def generate_al():
-    data = country_data["AL"]
-    bank_code = generate_numeric(data["bank_code_length"])
-    account_number = generate_alphanum(data["account_length"])
-    return bank_code + account_number
-
-def generate_ad():
-    data = country_data["AD"]
-    bank_code = generate_numeric(data["bank_code_length"])
-    account_number = generate_alphanum(data["account_length"])
-    return bank_code + account_number
-
-def generate_at():
-    data = country_data["AT"]
-    bank_code = generate_numeric(data["bank_code_length"])
-    account_number = generate_numeric(data["account_length"])
-    return bank_code + account_number
-
-def generate_az():
-    data = country_data["AZ"]
-    bank_code = random.choice(data["bank_codes"])
-    account_number = generate_alphanum(data["account_length"])
-    return bank_code + account_number
-
-def generate_bh():
-    data = country_data["BH"]
-    bank_code = random.choice(data["bank_codes"])
-    account_number = generate_alphanum(data["account_length"])
-    return bank_code + account_number
-
-def generate_be():
-    data = country_data["BE"]
-    bank_code = generate_numeric(data["bank_code_length"])
-    account_number = generate_numeric(data["account_length"])
-    base = bank_code + account_number
-    check_digits = f"{97 - (int(base) % 97):02d}"
-    return bank_code + account_number + check_digits
-
-def generate_ba():
-    data = country_data["BA"]
-    bank_code = generate_numeric(data["bank_code_length"])
-    branch_code = generate_numeric(data["branch_code_length"])
-    account_number = generate_numeric(data["account_length"])
-    check_digits = generate_numeric(data["check_digits_length"])
-    return bank_code + branch_code + account_number + check_digits
-
-def generate_br():
-    data = country_data["BR"]
-    bank_code = generate_numeric(data["bank_code_length"])
-    branch_code = generate_numeric(data["branch_code_length"])
-    account_number = generate_numeric(data["account_length"])
-    account_type = generate_alpha(data["account_type_length"])
-    owner_type = generate_alpha(data["owner_type_length"])
-    return bank_code + branch_code + account_number + account_type + owner_type
-
-def generate_cr():
-    data = country_data["CR"]
-    bank_code = generate_numeric(data["bank_code_length"])
-    account_number = generate_numeric(data["account_length"])
-    return bank_code + account_number
-
-def generate_hr():
-    data = country_data["HR"]
-    bank_code = generate_numeric(data["bank_code_length"])
-    account_number = generate_numeric(data["account_length"])
-    return bank_code + account_number
-
-def generate_cy():
-    data = country_data["CY"]
-    bank_code = generate_numeric(data["bank_code_length"])
-    account_number = generate_alphanum(data["account_length"])
-    return bank_code + account_number
-
-def generate_cz():
-    data = country_data["CZ"]
-    bank_code = generate_numeric(data["bank_code_length"])
-    prefix = generate_numeric(data["prefix_length"])
-    account_number = generate_numeric(data["account_length"])
-    return bank_code + prefix + account_number
-
-def generate_dk():
-    data = country_data["DK"]
-    bank_code = generate_numeric(data["bank_code_length"])
-    account_number = generate_numeric(data["account_length"])
-    check_digit = generate_numeric(data["check_digit_length"])
-    return bank_code + account_number + check_digit
-
-def generate_do():
-    data = country_data["DO"]
-    bank_code = random.choice(data["bank_codes"])
-    account_number = generate_numeric(data["account_length"])
-    return bank_code + account_number
-
-def generate_eg():
-    data = country_data["EG"]
-    bank_code = generate_numeric(data["bank_code_length"])
-    branch_code = generate_numeric(data["branch_code_length"])
-    account_number = generate_numeric(data["account_length"])
-    return bank_code + branch_code + account_number
-
-def generate_sv():
-    data = country_data["SV"]
-    bank_code = random.choice(data["bank_codes"])
-    account_number = generate_numeric(data["account_length"])
-    return bank_code + account_number
-
-def generate_ee():
-    data = country_data["EE"]
-    bank_code = generate_numeric(data["bank_code_length"])
-    branch_code = generate_numeric(data["branch_code_length"])
-    account_number = generate_numeric(data["account_length"])
-    check_digit = generate_numeric(data["check_digit_length"])
-    return bank_code + branch_code + account_number + check_digit
-
-def generate_fo():
-    data = country_data["FO"]
-    bank_code = generate_numeric(data["bank_code_length"])
-    account_number = generate_numeric(data["account_length"])
-    check_digit = generate_numeric(data["check_digit_length"])
-    return bank_code + account_number + check_digit
-
-def generate_fi():
-    data = country_data["FI"]
-    bank_code = generate_numeric(data["bank_code_length"])
-    account_number = generate_numeric(data["account_length"])
-    check_digit = generate_numeric(data["check_digit_length"])
-    return bank_code + account_number + check_digit
-
-def generate_fr():
-    data = country_data["FR"]
-    bank_code = generate_numeric(data["bank_code_length"])
-    branch_code = generate_numeric(data["branch_code_length"])
-    account_number = generate_alphanum(data["account_length"])
-    key = generate_numeric(data["key_length"])
-    return bank_code + branch_code + account_number + key
-
-def generate_ge():
-    data = country_data["GE"]
-    bank_code = random.choice(data["bank_codes"])
-    account_number = generate_numeric(data["account_length"])
-    return bank_code + account_number
-
-def generate_de():
-    data = country_data["DE"]
-    bank_code = random.choice(data["bank_codes"])
-    account_number = generate_numeric(data["account_length"])
-    return bank_code + account_number
-
-def generate_gi():
-    data = country_data["GI"]
-    bank_code = random.choice(data["bank_codes"])
-    account_number = generate_alphanum(data["account_length"])
-    return bank_code + account_number
-
-def generate_gr():
-    data = country_data["GR"]
-    bank_code = generate_numeric(data["bank_code_length"])
-    branch_code = generate_numeric(data["branch_code_length"])
-    account_number = generate_alphanum(data["account_length"])
-    return bank_code + branch_code + account_number
-
-def generate_gl():
-    data = country_data["GL"]
-    bank_code = generate_numeric(data["bank_code_length"])
-    account_number = generate_numeric(data["account_length"])
-    check_digit = generate_numeric(data["check_digit_length"])
-    return bank_code + account_number + check_digit
-
-def generate_gt():
-    data = country_data["GT"]
-    bank_code = random.choice(data["bank_codes"])
-    account_number = generate_alphanum(data["account_length"])
-    return bank_code + account_number
-
-def generate_hu():
-    data = country_data["HU"]
-    bank_code = generate_numeric(data["bank_code_length"])
-    branch_code = generate_numeric(data["branch_code_length"])
-    check_digit = generate_numeric(data["check_digit_length"])
-    account_number = generate_numeric(data["account_length"])
-    second_check_digit = generate_numeric(data["second_check_digit_length"])
-    return bank_code + branch_code + check_digit + account_number + second_check_digit
-
-def generate_is():
-    data = country_data["IS"]
-    bank_code = generate_numeric(data["bank_code_length"])
-    branch_code = generate_numeric(data["branch_code_length"])
-    identification = generate_numeric(data["identification_length"])
-    account_number = generate_numeric(data["account_length"])
-    return bank_code + branch_code + identification + account_number
-
-def generate_ie():
-    data = country_data["IE"]
-    bank_code = random.choice(data["bank_codes"])
-    sort_code = generate_numeric(data["sort_code_length"])
-    account_number = generate_numeric(data["account_length"])
-    return bank_code + sort_code + account_number
-
-def generate_il():
-    data = country_data["IL"]
-    bank_code = generate_numeric(data["bank_code_length"])
-    account_number = generate_numeric(data["account_length"])
-    return bank_code + account_number
-
-def generate_it():
-    data = country_data["IT"]
-    bank_code = generate_numeric(data["bank_code_length"])
-    branch_code = generate_numeric(data["branch_code_length"])
-    account_number = generate_alphanum(data["account_length"])
-    weights = [1, 0, 5, 7, 9, 13, 15, 17, 19, 21, 2, 4, 18, 20, 11, 3, 6, 8, 12, 14, 16, 10, 22, 25, 24, 23]
-    cin_input = bank_code + branch_code + account_number
-    total = sum((ord(c) - ord('0') if c.isdigit() else ord(c) - ord('A') + 10) * weights[i % 26] for i, c in enumerate(cin_input))
-    cin = chr(65 + (total % 26))
-    return cin + bank_code + branch_code + account_number
-
-def generate_jo():
-    data = country_data["JO"]
-    bank_code = random.choice(data["bank_codes"])
-    branch_code = generate_numeric(data["branch_code_length"])
-    account_number = generate_alphanum(data["account_length"])
-    return bank_code + branch_code + account_number
-
-def generate_kz():
-    data = country_data["KZ"]
-    bank_code = generate_numeric(data["bank_code_length"])
-    account_number = generate_alphanum(data["account_length"])
-    return bank_code + account_number
-
-def generate_xk():
-    data = country_data["XK"]
-    bank_code = generate_numeric(data["bank_code_length"])
-    account_number = generate_numeric(data["account_length"])
-    check_digits = generate_numeric(data["check_digits_length"])
-    return bank_code + account_number + check_digits
-
-def generate_kw():
-    data = country_data["KW"]
-    bank_code = random.choice(data["bank_codes"])
-    account_number = generate_alphanum(data["account_length"])
-    return bank_code + account_number
-
-def generate_lv():
-    data = country_data["LV"]
-    bank_code = random.choice(data["bank_codes"])
-    account_number = generate_alphanum(data["account_length"])
-    return bank_code + account_number
-
-def generate_lb():
-    data = country_data["LB"]
-    bank_code = generate_numeric(data["bank_code_length"])
-    account_number = generate_alphanum(data["account_length"])
-    return bank_code + account_number
-
-def generate_li():
-    data = country_data["LI"]
-    bank_code = generate_numeric(data["bank_code_length"])
-    account_number = generate_alphanum(data["account_length"])
-    return bank_code + account_number
-
-def generate_lt():
-    data = country_data["LT"]
-    bank_code = generate_numeric(data["bank_code_length"])
-    account_number = generate_numeric(data["account_length"])
-    return bank_code + account_number
-
-def generate_lu():
-    data = country_data["LU"]
-    bank_code = generate_numeric(data["bank_code_length"])
-    account_number = generate_alphanum(data["account_length"])
-    return bank_code + account_number
-
-def generate_mk():
-    data = country_data["MK"]
-    bank_code = generate_numeric(data["bank_code_length"])
-    account_number = generate_alphanum(data["account_length"])
-    check_digits = generate_numeric(data["check_digits_length"])
-    return bank_code + account_number + check_digits
-
-def generate_mt():
-    data = country_data["MT"]
-    bank_code = random.choice(data["bank_codes"])
-    branch_code = generate_numeric(data["branch_code_length"])
-    account_number = generate_alphanum(data["account_length"])
-    return bank_code + branch_code + account_number
-
-def generate_mr():
-    data = country_data["MR"]
-    bank_code = generate_numeric(data["bank_code_length"])
-    branch_code = generate_numeric(data["branch_code_length"])
-    account_number = generate_numeric(data["account_length"])
-    check_digits = generate_numeric(data["check_digits_length"])
-    return bank_code + branch_code + account_number + check_digits
-
-def generate_mc():
-    data = country_data["MC"]
-    bank_code = generate_numeric(data["bank_code_length"])
-    branch_code = generate_numeric(data["branch_code_length"])
-    account_number = generate_alphanum(data["account_length"])
-    key = generate_numeric(data["key_length"])
-    return bank_code + branch_code + account_number + key
-
-def generate_me():
-    data = country_data["ME"]
-    bank_code = generate_numeric(data["bank_code_length"])
-    account_number = generate_numeric(data["account_length"])
-    check_digits = generate_numeric(data["check_digits_length"])
-    return bank_code + account_number + check_digits
-
-def generate_nl():
-    data = country_data["NL"]
-    bank_code = random.choice(data["bank_codes"])
-    account_number = generate_numeric(data["account_length"])
-    return bank_code + account_number
-
-def generate_no():
-    data = country_data["NO"]
-    bank_code = generate_numeric(data["bank_code_length"])
-    account_number = generate_numeric(data["account_length"])
-    check_digit = generate_numeric(data["check_digit_length"])
-    return bank_code + account_number + check_digit
-
-def generate_pk():
-    data = country_data["PK"]
-    bank_code = random.choice(data["bank_codes"])
-    account_number = generate_numeric(data["account_length"])
-    return bank_code + account_number
-
-def generate_pl():
-    data = country_data["PL"]
-    bank_code = generate_numeric(data["bank_code_length"])
-    account_number = generate_numeric(data["account_length"])
-    return bank_code + account_number
-
-def generate_pt():
-    data = country_data["PT"]
-    bank_code = generate_numeric(data["bank_code_length"])
-    branch_code = generate_numeric(data["branch_code_length"])
-    account_number = generate_numeric(data["account_length"])
-    return bank_code + branch_code + account_number
-
-def generate_qa():
-    data = country_data["QA"]
-    bank_code = random.choice(data["bank_codes"])
-    account_number = generate_alphanum(data["account_length"])
-    return bank_code + account_number
-
-def generate_md():
-    data = country_data["MD"]
-    bank_code = random.choice(data["bank_codes"])
-    account_number = generate_alphanum(data["account_length"])
-    return bank_code + account_number
-
-def generate_ro():
-    data = country_data["RO"]
-    bank_code = random.choice(data["bank_codes"])
-    account_number = generate_alphanum(data["account_length"])
-    return bank_code + account_number
-
-def generate_sm():
-    data = country_data["SM"]
-    bank_code = generate_numeric(data["bank_code_length"])
-    branch_code = generate_numeric(data["branch_code_length"])
-    account_number = generate_alphanum(data["account_length"])
-    weights = [1, 0, 5, 7, 9, 13, 15, 17, 19, 21, 2, 4, 18, 20, 11, 3, 6, 8, 12, 14, 16, 10, 22, 25, 24, 23]
-    cin_input = bank_code + branch_code + account_number
-    total = sum((ord(c) - ord('0') if c.isdigit() else ord(c) - ord('A') + 10) * weights[i % 26] for i, c in enumerate(cin_input))
-    cin = chr(65 + (total % 26))
-    return cin + bank_code + branch_code + account_number
-
-def generate_sa():
-    data = country_data["SA"]
-    bank_code = generate_numeric(data["bank_code_length"])
-    account_number = generate_alphanum(data["account_length"])
-    return bank_code + account_number
-
-def generate_rs():
-    data = country_data["RS"]
-    bank_code = generate_numeric(data["bank_code_length"])
-    account_number = generate_numeric(data["account_length"])
-    check_digits = generate_numeric(data["check_digits_length"])
-    return bank_code + account_number + check_digits
-
-def generate_sk():
-    data = country_data["SK"]
-    bank_code = generate_numeric(data["bank_code_length"])
-    prefix = generate_numeric(data["prefix_length"])
-    account_number = generate_numeric(data["account_length"])
-    return bank_code + prefix + account_number
-
-def generate_si():
-    data = country_data["SI"]
-    bank_code = generate_numeric(data["bank_code_length"])
-    branch_code = generate_numeric(data["branch_code_length"])
-    account_number = generate_numeric(data["account_length"])
-    check_digits = generate_numeric(data["check_digits_length"])
-    return bank_code + branch_code + account_number + check_digits
-
-def generate_es():
-    data = country_data["ES"]
-    bank_code = generate_numeric(data["bank_code_length"])
-    branch_code = generate_numeric(data["branch_code_length"])
-    check_digits = generate_numeric(data["check_digits_length"])
-    account_number = generate_numeric(data["account_length"])
-    return bank_code + branch_code + check_digits + account_number
-
-def generate_se():
-    data = country_data["SE"]
-    bank_code = generate_numeric(data["bank_code_length"])
-    account_number = generate_numeric(data["account_length"])
-    check_digit = generate_numeric(data["check_digit_length"])
-    return bank_code + account_number + check_digit
-
-def generate_ch():
-    data = country_data["CH"]
-    bank_code = generate_numeric(data["bank_code_length"])
-    account_number = generate_alphanum(data["account_length"])
-    return bank_code + account_number
-
-def generate_tl():
-    data = country_data["TL"]
-    bank_code = generate_numeric(data["bank_code_length"])
-    account_number = generate_numeric(data["account_length"])
-    check_digits = generate_numeric(data["check_digits_length"])
-    return bank_code + account_number + check_digits
-
-def generate_tr():
-    data = country_data["TR"]
-    bank_code = generate_numeric(data["bank_code_length"])
-    reserved = generate_numeric(data["reserved_length"])
-    account_number = generate_alphanum(data["account_length"])
-    return bank_code + reserved + account_number
-
-def generate_ua():
-    data = country_data["UA"]
-    bank_code = generate_numeric(data["bank_code_length"])
-    account_number = generate_alphanum(data["account_length"])
-    return bank_code + account_number
-
-def generate_ae():
-    data = country_data["AE"]
-    bank_code = generate_numeric(data["bank_code_length"])
-    account_number = generate_numeric(data["account_length"])
-    return bank_code + account_number
-
-def generate_gb():
-    data = country_data["GB"]
-    bank_code = random.choice(data["bank_codes"])
-    sort_code = generate_numeric(data["sort_code_length"])
-    account_number = generate_numeric(data["account_length"])
-    return bank_code + sort_code + account_number
-
-def generate_va():
-    data = country_data["VA"]
-    bank_code = generate_numeric(data["bank_code_length"])
-    account_number = generate_numeric(data["account_length"])
-    return bank_code + account_number
-
-def generate_vg():
-    data = country_data["VG"]
-    bank_code = random.choice(data["bank_codes"])
-    account_number = generate_numeric(data["account_length"])
-    return bank_code + account_number
+def _be_check_digits(columns: dict) -> list:
+    return [f"{(int(bank_code + account) % 97) or 97:02d}" for bank_code, account in zip(columns["bank_code"], columns["account_number"])]
+
+CIN_ODD_VALUES = [1, 0, 5, 7, 9, 13, 15, 17, 19, 21, 2, 4, 18, 20, 11, 3, 6, 8, 12, 14, 16, 10, 22, 25, 24, 23]
+CIN_VALUES = {c: (ord(c) - ord('0') if c.isdigit() else ord(c) - ord('A')) for c in ALPHANUM}
+CIN_TABLES = [
+    {c: CIN_ODD_VALUES[value] for c, value in CIN_VALUES.items()},
+    CIN_VALUES
+]
+
+def _cin(columns: dict) -> list:
+    cin_inputs = list(map("".join, zip(columns["bank_code"], columns["branch_code"], columns["account_number"])))
+    totals = [0] * len(cin_inputs)
+    for i, chars in enumerate(zip(*cin_inputs)):
+        totals = list(map(operator.add, totals, map(CIN_TABLES[i % 2].__getitem__, chars)))
+    return [ALPHA[total % 26] for total in totals]
+
+LETTER_DIGITS = str.maketrans({c: str(ord(c) - 55) for c in ALPHA})
+CHECK_DIGIT_STRINGS = tuple(f"{98 - mod:02d}" for mod in range(97))
+
+def weight_tables(weights) -> tuple:
+    return tuple({digit: int(digit) * weight for digit in NUMERIC} for weight in weights)
+
+def _weighted_sums(values: list, tables: tuple) -> list:
+    return [sum(map(operator.getitem, tables, value)) for value in values]
+
+def _joined(columns: dict, *names) -> list:
+    return list(map("".join, zip(*(columns[name] for name in names if name in columns))))
+
+def _mod97_10(columns: dict) -> list:
+    return [
+        CHECK_DIGIT_STRINGS[int(value.translate(LETTER_DIGITS)) * 100 % 97]
+        for value in _joined(columns, "bank_code", "branch_code", "account_number")
+    ]
+
+ES_WEIGHTS = (1, 2, 4, 8, 5, 10, 9, 7, 3, 6)
+ES_OFFICE_TABLES = weight_tables(ES_WEIGHTS[2:])
+ES_ACCOUNT_TABLES = weight_tables(ES_WEIGHTS)
+ES_DIGITS = "01987654321"
+
+def _es_dc(columns: dict) -> list:
+    office = _weighted_sums(_joined(columns, "bank_code", "branch_code"), ES_OFFICE_TABLES)
+    account = _weighted_sums(columns["account_number"], ES_ACCOUNT_TABLES)
+    return [ES_DIGITS[first % 11] + ES_DIGITS[second % 11] for first, second in zip(office, account)]
+
+RIB_LETTERS = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "12345678912345678923456789")
+
+def _rib_key(columns: dict) -> list:
+    return [
+        f"{97 - (89 * int(bank_code) + 15 * int(branch_code) + 3 * int(account.translate(RIB_LETTERS))) % 97:02d}"
+        for bank_code, branch_code, account in zip(columns["bank_code"], columns["branch_code"], columns["account_number"])
+    ]
+
+MOD11_DIGITS = tuple(None if -remainder % 11 == 10 else str(-remainder % 11) for remainder in range(11))
+MOD10_DIGITS = tuple(str(-remainder % 10) for remainder in range(10))
+NO_TABLES = weight_tables((5, 4, 3, 2, 7, 6, 5, 4, 3, 2))
+DK_TABLES = weight_tables((4, 3, 2, 7, 6, 5, 4, 3, 2))
+
+def _mod11(values: list, tables: tuple) -> list:
+    return [MOD11_DIGITS[total % 11] for total in _weighted_sums(values, tables)]
+
+def _no_mod11(columns: dict) -> list:
+    return _mod11(_joined(columns, "bank_code", "account_number"), NO_TABLES)
+
+def _dk_mod11(columns: dict) -> list:
+    return _mod11(columns["account_number"], DK_TABLES)
+
+LUHN_DOUBLED = {digit: sum(divmod(int(digit) * 2, 10)) for digit in NUMERIC}
+LUHN_SINGLE = {digit: int(digit) for digit in NUMERIC}
+LUHN_TABLES = (LUHN_DOUBLED, LUHN_SINGLE) * 17
+
+def _luhn(columns: dict) -> list:
+    values = _joined(columns, "bank_code", "account_number")
+    return [MOD10_DIGITS[sum(map(operator.getitem, LUHN_TABLES, reversed(value))) % 10] for value in values]
+
+HU_TABLES = weight_tables((9, 7, 3, 1) * 4)
+
+def _hu_branch_check(columns: dict) -> list:
+    return [MOD10_DIGITS[total % 10] for total in _weighted_sums(_joined(columns, "bank_code", "branch_code"), HU_TABLES)]
+
+def _hu_account_check(columns: dict) -> list:
+    return [MOD10_DIGITS[total % 10] for total in _weighted_sums(columns["account_number"], HU_TABLES)]
+
+NATIONAL_CHECKSUMS = {
+    "be_mod97": _be_check_digits,
+    "it_cin": _cin,
+    "mod97_10": _mod97_10,
+    "es_dc": _es_dc,
+    "fr_rib": _rib_key,
+    "no_mod11": _no_mod11,
+    "dk_mod11": _dk_mod11,
+    "luhn": _luhn,
+    "hu_branch": _hu_branch_check,
+    "hu_account": _hu_account_check
+}
+
+COUNTRY_CHECKSUMS = {
+    "BA": {"national_check_digits": "mod97_10"},
+    "BE": {"national_check_digits": "be_mod97"},
+    "DK": {"national_check_digit": "dk_mod11"},
+    "ES": {"national_check_digits": "es_dc"},
+    "FI": {"national_check_digit": "luhn"},
+    "FR": {"key": "fr_rib"},
+    "HU": {"national_check_digit": "hu_branch", "second_national_check_digit": "hu_account"},
+    "IT": {"cin": "it_cin"},
+    "MC": {"key": "fr_rib"},
+    "ME": {"national_check_digits": "mod97_10"},
+    "MK": {"national_check_digits": "mod97_10"},
+    "NO": {"national_check_digit": "no_mod11"},
+    "PT": {"national_check_digits": "mod97_10"},
+    "RS": {"national_check_digits": "mod97_10"},
+    "SI": {"national_check_digits": "mod97_10"},
+    "SM": {"cin": "it_cin"}
+}
+
+GENERATION_ONLY_CHECKSUMS = {"dk_mod11"}
+
+class FrozenSpec:
+    __slots__ = ()
+
+    def __init__(self, **values):
+        for name in self.__slots__:
+            object.__setattr__(self, name, values[name])
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __repr__(self):
+        values = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({values})"
+
+class FieldSpec(FrozenSpec):
+    __slots__ = ("name", "length", "charset", "choices", "checksum", "verify")
+
+class CountrySpec(FrozenSpec):
+    __slots__ = ("code", "length", "bban_length", "fields", "slices", "numeric", "check_digit_shift", "check_digit_tail")
+
+def _choices_charset(choices) -> str:
+    chars = "".join(choices)
+    if chars.isdigit():
+        return NUMERIC
+    if chars.isalpha():
+        return ALPHA
+    return ALPHANUM
+
+def compile_field_specs(country: str, data: dict) -> tuple:
+    charsets = FIELD_CHARSETS.get(country, {})
+    checksums = COUNTRY_CHECKSUMS.get(country, {})
+    fields = []
+    for key, value in data.items():
+        if key == "bank_codes":
+            choices = tuple(value)
+            fields.append(FieldSpec(name="bank_code", length=len(choices[0]), charset=_choices_charset(choices), choices=choices, checksum=None, verify=False))
+        elif key == "check_char" and value:
+            fields.append(FieldSpec(name="cin", length=1, charset=ALPHA, choices=None, checksum=NATIONAL_CHECKSUMS[checksums["cin"]], verify=True))
+        elif key.endswith("_length"):
+            name = key[:-len("_length")]
+            name = FIELD_NAMES.get(name, name)
+            checksum = NATIONAL_CHECKSUMS[checksums[name]] if name in checksums else None
+            verify = checksum is not None and checksums[name] not in GENERATION_ONLY_CHECKSUMS
+            fields.append(FieldSpec(name=name, length=value, charset=charsets.get(name, NUMERIC), choices=None, checksum=checksum, verify=verify))
+    return tuple(fields)
+
+def compile_country_spec(country: str, data: dict) -> CountrySpec:
+    fields = compile_field_specs(country, data)
+    bban_length = sum(field.length for field in fields)
+    if bban_length + 4 != data["length"]:
+        raise ValueError(f"country_data[{country!r}] describes a {bban_length}-character BBAN, expected {data['length'] - 4}")
+    slices = []
+    offset = 0
+    for field in fields:
+        slices.append((field.name, offset, offset + field.length))
+        offset += field.length
+    tail = (country + "00").translate(LETTER_DIGITS)
+    return CountrySpec(
+        code=country,
+        length=data["length"],
+        bban_length=bban_length,
+        fields=fields,
+        slices=tuple(slices),
+        numeric=all(field.charset == NUMERIC for field in fields),
+        check_digit_shift=pow(10, len(tail), 97),
+        check_digit_tail=int(tail) % 97
+    )
+
+COUNTRY_SPECS = {country: compile_country_spec(country, data) for country, data in country_data.items()}
+
+def generate_bban_batch(country: str, count: int, rng=random) -> list:
+    fields = COUNTRY_SPECS[country].fields
+    columns = {}
+    for field in fields:
+        if field.checksum is not None:
+            continue
+        sampler = bank_code_sampler(country) if field.name == "bank_code" else None
+        if sampler is not None:
+            columns[field.name] = sampler.sample(count, rng)
+        elif field.choices is not None:
+            columns[field.name] = rng.choices(field.choices, k=count)
+        else:
+            length = field.length
+            size = length * count
+            chars = random_chars(field.charset, size, rng)
+            columns[field.name] = [chars[i:i + length] for i in range(0, size, length)]
+    checked = []
+    for field in fields:
+        if field.checksum is not None:
+            columns[field.name] = field.checksum(columns)
+            checked.append(columns[field.name])
+    rows = zip(*(columns[field.name] for field in fields))
+    if not any(None in column for column in checked):
+        return list(map("".join, rows))
+    bbans = [None if None in row else "".join(row) for row in rows]
+    rejected = [index for index, bban in enumerate(bbans) if bban is None]
+    for index, bban in zip(rejected, generate_bban_batch(country, len(rejected), rng)):
+        bbans[index] = bban
+    return bbans
+
+def generate_bban(country: str, rng=random) -> str:
+    return generate_bban_batch(country, 1, rng)[0]
+
+SEED_BLOCK_SIZE = 4096
+
+def block_rng(seed: int, stream: int, block: int, label: str = "") -> random.Random:
+    digest = hashlib.blake2b(f"{label}:{seed}:{stream}:{block}".encode(), digest_size=16).digest()
+    return random.Random(int.from_bytes(digest, "big"))
+
+def iter_blocks(generate, label: str, count: int, seed=None, stream: int = 0, offset: int = 0):
+    if seed is None:
+        rng = random.Random()
+        while count > 0:
+            size = min(count, SEED_BLOCK_SIZE)
+            yield generate(size, rng)
+            count -= size
+        return
+    start, stop = offset, offset + count
+    for block in range(start // SEED_BLOCK_SIZE, -(-stop // SEED_BLOCK_SIZE)):
+        block_start = block * SEED_BLOCK_SIZE
+        rows = generate(SEED_BLOCK_SIZE, block_rng(seed, stream, block, label))
+        yield rows[max(start - block_start, 0):stop - block_start]
+
+def iter_bban_blocks(country: str, count: int, seed=None, stream: int = 0, offset: int = 0):
+    return iter_blocks(functools.partial(generate_bban_batch, country), country, count, seed, stream, offset)
+
+class AliasTable:
+    def __init__(self, items: list, weights: list):
+        size = len(items)
+        total = sum(weights)
+        scaled = [weight * size / total for weight in weights]
+        small = [index for index, value in enumerate(scaled) if value < 1]
+        large = [index for index, value in enumerate(scaled) if value >= 1]
+        self.items = items
+        self.prob = [1.0] * size
+        self.alias = list(range(size))
+        while small and large:
+            low = small.pop()
+            high = large.pop()
+            self.prob[low] = scaled[low]
+            self.alias[low] = high
+            scaled[high] -= 1 - scaled[low]
+            (small if scaled[high] < 1 else large).append(high)
+        self.keep = list(items)
+        self.other = [items[index] for index in self.alias]
+
+    def sample(self, count: int, rng=random) -> list:
+        size = len(self.items)
+        prob, keep, other = self.prob, self.keep, self.other
+        draws = [rng.random() * size for _ in range(count)]
+        return [keep[index] if draw - index < prob[index] else other[index] for draw, index in zip(draws, map(int, draws))]
+
+BANK_REGISTRY_PATH = os.environ.get("IBAN_BANK_REGISTRY", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "banks.csv"))
+
+_bank_registry = None
+_bank_registry_lock = threading.Lock()
+
+def bank_registry():
+    global _bank_registry
+    if _bank_registry is not None:
+        return _bank_registry
+    if not BANK_REGISTRY_PATH or not os.path.exists(BANK_REGISTRY_PATH):
+        return None
+    import banks
+    with _bank_registry_lock:
+        if _bank_registry is None:
+            try:
+                _bank_registry = banks.load_registry(BANK_REGISTRY_PATH)
+            except (OSError, ValueError):
+                logger.exception("Could not load bank registry from %s", BANK_REGISTRY_PATH)
+        return _bank_registry
+
+def bank_code_sampler(country: str):
+    registry = bank_registry()
+    return registry_sampler(registry, country) if registry is not None else None
+
+@functools.lru_cache(maxsize=None)
+def registry_sampler(registry, country: str):
+    field = next((field for field in COUNTRY_SPECS[country].fields if field.name == "bank_code"), None)
+    if field is None:
+        return None
+    entries = [(code, weight) for code, weight in registry.country_banks(country) if len(code) == field.length and not code.strip(field.charset) and weight > 0]
+    if not entries:
+        return None
+    codes, weights = zip(*entries)
+    return AliasTable(list(codes), list(weights))
+
+def bank_details(country: str, bank_code: str):
+    registry = bank_registry()
+    return registry.lookup(country, bank_code) if registry is not None else None
+
+def field_choices(country: str, field: FieldSpec):
+    sampler = bank_code_sampler(country) if field.name == "bank_code" else None
+    return tuple(sampler.items) if sampler is not None else field.choices
+
+def generate_mixed_batch(table: AliasTable, count: int, rng=random) -> list:
+    countries = table.sample(count, rng)
+    rows = {}
+    for country, size in Counter(countries).items():
+        bbans = generate_bban_batch(country, size, rng)
+        rows[country] = iter(zip(calculate_check_digits_batch(country, bbans), bbans))
+    return [(country, *next(rows[country])) for country in countries]
+
+def iter_mixed_blocks(table: AliasTable, count: int, seed=None, stream: int = 0, offset: int = 0):
+    return iter_blocks(functools.partial(generate_mixed_batch, table), "mix:" + ",".join(table.items), count, seed, stream, offset)
+
+FINGERPRINT_PRIME = 2**64 - 59
+UNIQUE_MAX_FILL = 0.5
+UNIQUE_MAX_DRAWS = 4
+
+def bban_keyspace(country: str) -> int:
+    keyspace = 1
+    for field in COUNTRY_SPECS[country].fields:
+        if field.checksum is None:
+            choices = field_choices(country, field)
+            keyspace *= len(choices) if choices is not None else len(field.charset) ** field.length
+    return keyspace
+
+def unique_key(country: str):
+    spec = COUNTRY_SPECS[country]
+    if spec.numeric and spec.bban_length <= 19:
+        return int
+    if spec.bban_length <= 12:
+        return functools.partial(int, base=36)
+    return lambda bban: int(bban, 36) % FINGERPRINT_PRIME
+
+class PackedKeySet:
+    def __init__(self, capacity: int):
+        bits = max((capacity * 4 // 3).bit_length(), 4)
+        self.shift = 64 - bits
+        self.mask = (1 << bits) - 1
+        self.slots = array("Q", bytes(8 << bits))
+        self.count = 0
+
+    def add(self, key: int) -> bool:
+        key += 1
+        slots = self.slots
+        mask = self.mask
+        index = ((key * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF) >> self.shift
+        while True:
+            slot = slots[index]
+            if slot == 0:
+                slots[index] = key
+                self.count += 1
+                return True
+            if slot == key:
+                return False
+            index = (index + 1) & mask
+
+def iter_unique_bban_blocks(country: str, count: int, seed=None, stream: int = 0):
+    keys = PackedKeySet(count + SEED_BLOCK_SIZE)
+    key = unique_key(country)
+    add = keys.add
+    for bbans in iter_bban_blocks(country, UNIQUE_MAX_DRAWS * count + SEED_BLOCK_SIZE, seed, stream):
+        fresh = [bban for bban in bbans if add(key(bban))]
+        if keys.count >= count:
+            yield fresh[:len(fresh) - (keys.count - count)]
+            return
+        if fresh:
+            yield fresh
+    raise RuntimeError(f"Could not draw {count} unique BBANs for {country}")
+
+def parse_bban(country: str, bban: str) -> dict:
+    return {name: bban[start:stop] for name, start, stop in COUNTRY_SPECS[country].slices}
+
+def calculate_check_digits_fast(country: str, bban: str) -> str:
+    spec = COUNTRY_SPECS[country]
+    return CHECK_DIGIT_STRINGS[(int(bban.translate(LETTER_DIGITS)) * spec.check_digit_shift + spec.check_digit_tail) % 97]
+
+def calculate_check_digits_batch(country: str, bbans: list) -> list:
+    spec = COUNTRY_SPECS[country]
+    shift = spec.check_digit_shift
+    tail = spec.check_digit_tail
+    table = CHECK_DIGIT_STRINGS
+    if spec.numeric:
+        try:
+            return [table[(int(bban) * shift + tail) % 97] for bban in bbans]
+        except ValueError:
+            pass
+    letters = LETTER_DIGITS
+    return [table[(int(bban.translate(letters)) * shift + tail) % 97] for bban in bbans]
+
+ENUMERATED_FIELD = "account_number"
+
+def enumeration_fields(country: str, values: dict) -> dict:
+    fixed = {}
+    for field in COUNTRY_SPECS[country].fields:
+        if field.checksum is not None or field.name == ENUMERATED_FIELD:
+            continue
+        choices = field_choices(country, field)
+        value = values.get(field.name)
+        if value is None:
+            value = choices[0] if choices is not None else field.charset[0] * field.length
+        known = field.choices is None or value in field.choices or value in choices
+        if len(value) != field.length or value.strip(field.charset) or not known:
+            allowed = f"one of {', '.join(choices)}" if choices is not None else f"{field.length} characters from {field.charset}"
+            raise ValueError(f"{field.name} must be {allowed}")
+        fixed[field.name] = value
+    return fixed
+
+def iter_enumerated_bbans(country: str, fixed: dict, start: int, stop: int):
+    spec = COUNTRY_SPECS[country]
+    account_length = next(field.length for field in spec.fields if field.name == ENUMERATED_FIELD)
+    if any(field.checksum is not None for field in spec.fields):
+        account = f"{{:0{account_length}d}}".format
+        for block_start in range(start, stop, SEED_BLOCK_SIZE):
+            block_stop = min(block_start + SEED_BLOCK_SIZE, stop)
+            columns = {name: [value] * (block_stop - block_start) for name, value in fixed.items()}
+            columns[ENUMERATED_FIELD] = list(map(account, range(block_start, block_stop)))
+            for field in spec.fields:
+                if field.checksum is not None:
+                    columns[field.name] = field.checksum(columns)
+            bbans = ["".join(row) for row in zip(*(columns[field.name] for field in spec.fields)) if None not in row]
+            yield bbans, calculate_check_digits_batch(country, bbans)
+        return
+    names = [field.name for field in spec.fields]
+    position = names.index(ENUMERATED_FIELD)
+    prefix = "".join(fixed[name] for name in names[:position])
+    suffix = "".join(fixed[name] for name in names[position + 1:])
+    step = pow(10, len(suffix.translate(LETTER_DIGITS)), 97) * spec.check_digit_shift % 97
+    base = (int(f"{prefix}{'0' * account_length}{suffix}".translate(LETTER_DIGITS)) * spec.check_digit_shift + spec.check_digit_tail) % 97
+    period = [CHECK_DIGIT_STRINGS[(base + i * step) % 97] for i in range(97)]
+    width = min(account_length, 4)
+    tails = [f"{low:0{width}d}{suffix}" for low in range(10 ** width)]
+    block_start = start
+    while block_start < stop:
+        high, low = divmod(block_start, 10 ** width)
+        size = min(10 ** width - low, stop - block_start)
+        head = prefix + (f"{high:0{account_length - width}d}" if account_length > width else "")
+        phase = block_start % 97
+        cycle = period[phase:] + period[:phase]
+        yield list(map(head.__add__, tails[low:low + size])), (cycle * (size // 97 + 1))[:size]
+        block_start += size
+
+def self_test_check_digits(samples: int = 200) -> int:
+    checked = 0
+    for country, spec in COUNTRY_SPECS.items():
+        bban_length = spec.bban_length
+        bbans = generate_bban_batch(country, samples)
+        bbans += ["0" * bban_length, "9" * bban_length, "Z" * bban_length, "A" + "0" * (bban_length - 1)]
+        expected = [calculate_check_digits(country, bban) for bban in bbans]
+        if calculate_check_digits_batch(country, bbans) != expected:
+            raise AssertionError(f"Batched check digit kernel disagrees with calculate_check_digits for {country}")
+        for bban, check_digits in zip(bbans, expected):
+            if calculate_check_digits_fast(country, bban) != check_digits:
+                raise AssertionError(f"Check digit kernel disagrees with calculate_check_digits for {country}{bban}")
+        checked += len(bbans)
+    return checked
+
+def check_iban(iban: str) -> tuple:
+    iban = iban.replace(" ", "").upper()
+    country = iban[:2]
+    spec = COUNTRY_SPECS.get(country)
+    if spec is None:
+        return iban, country, "Unsupported country code"
+    if len(iban) != spec.length:
+        return iban, country, f"Invalid length: expected {spec.length}, got {len(iban)}"
+    bban = iban[4:]
+    for field, (name, start, stop) in zip(spec.fields, spec.slices):
+        if bban[start:stop].strip(field.charset):
+            return iban, country, f"Invalid characters in {name}"
+    if calculate_check_digits_fast(country, bban) != iban[2:4]:
+        return iban, country, "Invalid check digits"
+    columns = None
+    for field in spec.fields:
+        if not field.verify:
+            continue
+        if columns is None:
+            columns = {name: [value] for name, value in parse_bban(country, bban).items()}
+        if field.checksum(columns) != columns[field.name]:
+            return iban, country, f"Invalid {field.name.replace('_', ' ')}"
+    return iban, country, None
+
+def iban_details(iban: str, country: str):
+    spec = COUNTRY_SPECS.get(country)
+    if spec is None or len(iban) != spec.length:
+        return None
+    bban = iban[4:]
+    details = {"bban": bban, "check_digits": iban[2:4]}
+    details.update(parse_bban(country, bban))
+    add_bank_details(country, details)
+    return details
+
+def add_bank_details(country: str, details: dict):
+    field = next((field for field in COUNTRY_SPECS[country].fields if field.name == "bank_code"), None)
+    bank_code = details.get("bank_code")
+    if field is None or bank_code is None or bank_code.strip(field.charset):
+        return
+    bank = bank_details(country, bank_code)
+    if bank is not None:
+        details["bank_name"] = bank["name"]
+        details["bic"] = bank["bic"]
 
 COUNTRY_GENERATORS = {
-    "AL": {"length": 28, "generator": generate_al},
-    "AD": {"length": 24, "generator": generate_ad},
-    "AT": {"length": 20, "generator": generate_at},
-    "AZ": {"length": 28, "generator": generate_az},
-    "BH": {"length": 22, "generator": generate_bh},
-    "BE": {"length": 16, "generator": generate_be},
-    "BA": {"length": 20, "generator": generate_ba},
-    "BR": {"length": 29, "generator": generate_br},
-    "CR": {"length": 22, "generator": generate_cr},
-    "HR": {"length": 21, "generator": generate_hr},
-    "CY": {"length": 28, "generator": generate_cy},
-    "CZ": {"length": 24, "generator": generate_cz},
-    "DK": {"length": 18, "generator": generate_dk},
-    "DO": {"length": 28, "generator": generate_do},
-    "EG": {"length": 29, "generator": generate_eg},
-    "SV": {"length": 28, "generator": generate_sv},
-    "EE": {"length": 20, "generator": generate_ee},
-    "FO": {"length": 18, "generator": generate_fo},
-    "FI": {"length": 18, "generator": generate_fi},
-    "FR": {"length": 27, "generator": generate_fr},
-    "GE": {"length": 22, "generator": generate_ge},
-    "DE": {"length": 22, "generator": generate_de},
-    "GI": {"length": 23, "generator": generate_gi},
-    "GR": {"length": 27, "generator": generate_gr},
-    "GL": {"length": 18, "generator": generate_gl},
-    "GT": {"length": 28, "generator": generate_gt},
-    "HU": {"length": 28, "generator": generate_hu},
-    "IS": {"length": 26, "generator": generate_is},
-    "IE": {"length": 22, "generator": generate_ie},
-    "IL": {"length": 23, "generator": generate_il},
-    "IT": {"length": 27, "generator": generate_it},
-    "JO": {"length": 30, "generator": generate_jo},
-    "KZ": {"length": 20, "generator": generate_kz},
-    "XK": {"length": 20, "generator": generate_xk},
-    "KW": {"length": 30, "generator": generate_kw},
-    "LV": {"length": 21, "generator": generate_lv},
-    "LB": {"length": 28, "generator": generate_lb},
-    "LI": {"length": 21, "generator": generate_li},
-    "LT": {"length": 20, "generator": generate_lt},
-    "LU": {"length": 20, "generator": generate_lu},
-    "MK": {"length": 19, "generator": generate_mk},
-    "MT": {"length": 31, "generator": generate_mt},
-    "MR": {"length": 27, "generator": generate_mr},
-    "MC": {"length": 27, "generator": generate_mc},
-    "ME": {"length": 22, "generator": generate_me},
-    "NL": {"length": 18, "generator": generate_nl},
-    "NO": {"length": 15, "generator": generate_no},
-    "PK": {"length": 24, "generator": generate_pk},
-    "PL": {"length": 28, "generator": generate_pl},
-    "PT": {"length": 25, "generator": generate_pt},
-    "QA": {"length": 29, "generator": generate_qa},
-    "MD": {"length": 24, "generator": generate_md},
-    "RO": {"length": 24, "generator": generate_ro},
-    "SM": {"length": 27, "generator": generate_sm},
-    "SA": {"length": 24, "generator": generate_sa},
-    "RS": {"length": 22, "generator": generate_rs},
-    "SK": {"length": 24, "generator": generate_sk},
-    "SI": {"length": 19, "generator": generate_si},
-    "ES": {"length": 24, "generator": generate_es},
-    "SE": {"length": 24, "generator": generate_se},
-    "CH": {"length": 21, "generator": generate_ch},
-    "TL": {"length": 23, "generator": generate_tl},
-    "TR": {"length": 26, "generator": generate_tr},
-    "UA": {"length": 29, "generator": generate_ua},
-    "AE": {"length": 23, "generator": generate_ae},
-    "GB": {"length": 22, "generator": generate_gb},
-    "VA": {"length": 22, "generator": generate_va},
-    "VG": {"length": 24, "generator": generate_vg}
+    country: {"length": spec.length, "generator": functools.partial(generate_bban, country)}
+    for country, spec in COUNTRY_SPECS.items()
 }
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def dumps(value) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_SORT_KEYS)
+    return json.dumps(value, sort_keys=True, separators=(",", ":")).encode()
+
+def json_body(value) -> bytes:
+    return dumps(value) + b"\n"
+
+def json_response(body: bytes, status: int = 200) -> Response:
+    return Response(body, status=status, mimetype="application/json")
+
+HOME_BODY = json_body({
+    "message": "Welcome to the IBAN Generator API!",
+    "description": "Generate valid IBANs for various countries with realistic bank details.",
+    "tutorial": {
+        "step1": "Send a GET request to /api/iban/gen with a country code parameter, e.g., /api/iban/gen?code=DE",
+        "step2": "Receive a JSON response with the generated IBAN and detailed breakdown.",
+        "step3": "Check supported countries at /api/iban/countries.",
+        "step4": "Need many IBANs at once? Stream them from /api/iban/gen/bulk?code=DE&count=100000&format=ndjson (or format=csv, format=text). Add seed=<n> (and optionally stream=<n>, offset=<n>) for a reproducible dataset, code=DE,FR or code=ALL for several countries, workers=<n> to shard large jobs across processes, unique=true to guarantee no duplicates, and mix=DE:40,FR:20,NL:10 instead of code for a weighted country mix (count is then the total). To walk account numbers in order instead, use /api/iban/gen/range?code=DE&bank_code=37050198&start=0&stop=100000.",
+        "step5": "Validate an IBAN at /api/iban/validate?iban=<iban>, or POST one IBAN per line to /api/iban/validate/bulk.",
+        "step6": "Break an IBAN into bank code, branch, account and national check digits at /api/iban/parse?iban=<iban>, or POST one IBAN per line to /api/iban/parse/bulk.",
+        "step7": "Requests are limited per client by rows requested, and bulk jobs by how many run at once in each server process. Bulk uploads must carry a Content-Length header. If you were issued an API key, send it as X-API-Key to be limited separately from your IP, and wait for the Retry-After seconds when you receive a 429."
+    },
+    "example": {
+        "endpoint": "/api/iban/gen?code=DE",
+        "response": {
+            "iban": "DE48370501981234567890",
+            "country": "DE",
+            "valid": True,
+            "length": 22,
+            "details": {
+                "bban": "370501981234567890",
+                "check_digits": "48",
+                "bank_code": "37050198",
+                "account_number": "1234567890"
+            }
+        }
+    },
+    "api_owner": "@ISmartCoder",
+    "updates_channel": "t.me/TheSmartDev"
+})
+
 @app.route("/")
 def home():
-    return jsonify({
-        "message": "Welcome to the IBAN Generator API!",
-        "description": "Generate valid IBANs for various countries with realistic bank details.",
-        "tutorial": {
-            "step1": "Send a GET request to /api/iban/gen with a country code parameter, e.g., /api/iban/gen?code=DE",
-            "step2": "Receive a JSON response with the generated IBAN and detailed breakdown.",
-            "step3": "Check supported countries at /api/iban/countries."
-        },
-        "example": {
-            "endpoint": "/api/iban/gen?code=DE",
-            "response": {
-                "iban": "DE48370501981234567890",
-                "country": "DE",
-                "valid": True,
-                "length": 22,
-                "details": {
-                    "bban": "370501981234567890",
-                    "check_digits": "48",
-                    "bank_code": "37050198",
-                    "account_number": "1234567890"
-                }
-            }
-        },
+    return json_response(HOME_BODY)
+
+def _country_name(code: str) -> str:
+    name = EMBEDDED_COUNTRY_NAMES.get(code)
+    if name is not None:
+        return name
+    try:
+        import pycountry
+    except ImportError:
+        return "Unknown"
+    country = pycountry.countries.get(alpha_2=code)
+    return country.name if country else "Unknown"
+
+@functools.lru_cache(maxsize=None)
+def countries_response() -> tuple:
+    body = json_body({
+        "message": "Supported countries for IBAN generation",
+        "total_countries": len(COUNTRY_GENERATORS),
+        "countries": [{"code": code, "name": _country_name(code)} for code in COUNTRY_GENERATORS],
         "api_owner": "@ISmartCoder",
         "updates_channel": "t.me/TheSmartDev"
     })
+    return body, hashlib.sha256(body).hexdigest()[:32]
+
+COUNTRIES_CACHE_CONTROL = "public, max-age=86400"
 
 @app.route("/api/iban/countries")
 def list_countries():
-    countries_list = [
-        {"code": code, "name": pycountry.countries.get(alpha_2=code).name if pycountry.countries.get(alpha_2=code) else "Unknown"}
-        for code in COUNTRY_GENERATORS.keys()
-    ]
-    return jsonify({
-        "message": "Supported countries for IBAN generation",
-        "total_countries": len(COUNTRY_GENERATORS),
-        "countries": countries_list,
+    body, etag = countries_response()
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+    else:
+        response = Response(body, mimetype="application/json")
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = COUNTRIES_CACHE_CONTROL
+    return response
+
+MAX_SEED = 2 ** 64 - 1
+
+def error_payload(error: str, message: str) -> dict:
+    return {
+        "error": error,
+        "message": message,
         "api_owner": "@ISmartCoder",
         "updates_channel": "t.me/TheSmartDev"
-    })
+    }
+
+@functools.lru_cache(maxsize=256)
+def error_body(error: str, message: str) -> bytes:
+    return json_body(error_payload(error, message))
+
+def error_response(error: str, message: str, status: int = 400) -> Response:
+    return json_response(error_body(error, message), status)
+
+def unsupported_country_response():
+    return error_response("Unsupported country code", "Please provide a valid country code. Check supported countries at /api/iban/countries.")
+
+class InvalidRequest(ValueError):
+    def __init__(self, error: str, message: str):
+        super().__init__(message)
+        self.error = error
+
+def int_arg(args, name: str, default, minimum: int = 0, maximum: int = MAX_SEED):
+    value = args.get(name, "")
+    if value == "":
+        return default
+    if not (value.isascii() and value.isdigit()) or not minimum <= int(value) <= maximum:
+        raise InvalidRequest("Invalid parameter", f"{name} must be an integer between {minimum} and {maximum}.")
+    return int(value)
+
+def seed_args(args) -> tuple:
+    return int_arg(args, "seed", None), int_arg(args, "stream", 0), int_arg(args, "offset", 0)
+
+GENERATED_IBAN_TEMPLATE = (
+    b'{"api_owner":"@ISmartCoder","country":"%s","details":%s,"iban":"%s","length":%d,'
+    b'"updates_channel":"t.me/TheSmartDev","valid":true}\n'
+)
+
+def generated_iban_body(country: str, bban: str, check_digits: str) -> bytes:
+    details = {"bban": bban, "check_digits": check_digits}
+    details.update(parse_bban(country, bban))
+    add_bank_details(country, details)
+    iban = f"{country}{check_digits}{bban}"
+    return GENERATED_IBAN_TEMPLATE % (country.encode(), dumps(details), iban.encode(), len(iban))
+
+class IBANPool:
+    def __init__(self, capacity: int, low_water: int):
+        self.capacity = capacity
+        self.low_water = min(low_water, capacity)
+        self.buffers = {}
+        self.hits = defaultdict(int)
+        self.misses = defaultdict(int)
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._rng = random.Random()
+        self._thread = None
+
+    def pop(self, country: str):
+        buffer = self.buffers.get(country)
+        body = None
+        if buffer is not None:
+            try:
+                body = buffer.popleft()
+            except IndexError:
+                pass
+        with self._lock:
+            if body is None:
+                self.misses[country] += 1
+            else:
+                self.hits[country] += 1
+            if buffer is None:
+                buffer = self.buffers.setdefault(country, deque())
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="iban-pool-refill", daemon=True)
+                self._thread.start()
+        if len(buffer) < self.low_water:
+            self._wakeup.set()
+        return body
+
+    def refill(self):
+        for country, buffer in list(self.buffers.items()):
+            if len(buffer) >= self.low_water:
+                continue
+            while len(buffer) < self.capacity:
+                size = min(self.capacity - len(buffer), SEED_BLOCK_SIZE)
+                bbans = generate_bban_batch(country, size, self._rng)
+                buffer.extend(map(generated_iban_body, [country] * size, bbans, calculate_check_digits_batch(country, bbans)))
+
+    def _run(self):
+        while True:
+            self._wakeup.wait()
+            self._wakeup.clear()
+            try:
+                self.refill()
+            except Exception:
+                logger.exception("IBAN pool refill failed")
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                country: {"size": len(buffer), "hits": self.hits[country], "misses": self.misses[country]}
+                for country, buffer in self.buffers.items()
+            }
+
+IBAN_POOL = IBANPool(
+    int(os.environ.get("IBAN_POOL_CAPACITY", 1024)),
+    int(os.environ.get("IBAN_POOL_LOW_WATER", 256))
+) if os.environ.get("IBAN_POOL") == "1" else None
+
+@app.route("/api/iban/pool")
+def pool_stats():
+    if IBAN_POOL is None:
+        return json_response(json_body({"enabled": False, "api_owner": "@ISmartCoder", "updates_channel": "t.me/TheSmartDev"}))
+    countries = IBAN_POOL.stats()
+    return json_response(json_body({
+        "enabled": True,
+        "capacity": IBAN_POOL.capacity,
+        "low_water": IBAN_POOL.low_water,
+        "hits": sum(country["hits"] for country in countries.values()),
+        "misses": sum(country["misses"] for country in countries.values()),
+        "countries": countries,
+        "api_owner": "@ISmartCoder",
+        "updates_channel": "t.me/TheSmartDev"
+    }))
+
+class ResponseCache:
+    def __init__(self, max_bytes: int, max_entry_bytes: int, spill_dir=None, max_spill_bytes: int = 0):
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = min(max_entry_bytes, max_bytes)
+        self.spill_dir = spill_dir
+        self.max_spill_bytes = max_spill_bytes
+        self.entries = OrderedDict()
+        self.size = 0
+        self.spilled = OrderedDict()
+        self.spilled_size = 0
+        self._lock = threading.Lock()
+        self._pid = None
+        self._directory = None
+
+    def _process_dir(self) -> str:
+        pid = os.getpid()
+        if self._pid != pid:
+            self._pid = pid
+            self.spilled = OrderedDict()
+            self.spilled_size = 0
+            self._directory = os.path.join(self.spill_dir, str(pid))
+            remove_stale_spill_dirs(self.spill_dir)
+            os.makedirs(self._directory, exist_ok=True)
+            atexit.register(shutil.rmtree, self._directory, True)
+        return self._directory
+
+    def get(self, key: str):
+        with self._lock:
+            body = self.entries.get(key)
+            if body is not None:
+                self.entries.move_to_end(key)
+            spilled = body is None and self.spill_dir is not None and key in self.spilled and self._pid == os.getpid()
+        if body is not None:
+            METRICS.inc("iban_response_cache_total", (("result", "memory"),))
+            return body
+        if spilled:
+            try:
+                with open(os.path.join(self._directory, key), "rb") as f:
+                    body = f.read()
+            except OSError:
+                body = None
+            if body is not None:
+                METRICS.inc("iban_response_cache_total", (("result", "disk"),))
+                self.put(key, body)
+                return body
+        METRICS.inc("iban_response_cache_total", (("result", "miss"),))
+        return None
+
+    def put(self, key: str, body: bytes):
+        if len(body) > self.max_entry_bytes:
+            return
+        evicted = []
+        with self._lock:
+            previous = self.entries.pop(key, None)
+            if previous is not None:
+                self.size -= len(previous)
+            self.entries[key] = body
+            self.size += len(body)
+            while self.size > self.max_bytes:
+                evicted.append(self.entries.popitem(last=False))
+                self.size -= len(evicted[-1][1])
+        if self.spill_dir:
+            for evicted_key, evicted_body in evicted:
+                self._spill(evicted_key, evicted_body)
+
+    def _spill(self, key: str, body: bytes):
+        with self._lock:
+            try:
+                directory = self._process_dir()
+            except OSError:
+                logger.warning("Could not create cache spill directory under %s", self.spill_dir, exc_info=True)
+                return
+            if key in self.spilled:
+                self.spilled.move_to_end(key)
+                return
+        path = os.path.join(directory, key)
+        try:
+            with open(f"{path}.tmp", "wb") as f:
+                f.write(body)
+            os.replace(f"{path}.tmp", path)
+        except OSError:
+            logger.warning("Could not spill cached response to %s", path, exc_info=True)
+            return
+        removed = []
+        with self._lock:
+            self.spilled[key] = len(body)
+            self.spilled_size += len(body)
+            while self.spilled_size > self.max_spill_bytes and self.spilled:
+                removed.append(self.spilled.popitem(last=False))
+                self.spilled_size -= removed[-1][1]
+        for removed_key, _ in removed:
+            try:
+                os.remove(os.path.join(directory, removed_key))
+            except OSError:
+                pass
+
+def process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+def remove_stale_spill_dirs(spill_dir: str):
+    os.makedirs(spill_dir, exist_ok=True)
+    for entry in os.scandir(spill_dir):
+        if entry.name.isdigit() and entry.is_dir(follow_symlinks=False) and not process_alive(int(entry.name)):
+            shutil.rmtree(entry.path, ignore_errors=True)
+
+RESPONSE_CACHE = ResponseCache(
+    int(os.environ.get("IBAN_CACHE_BYTES", 64 << 20)),
+    int(os.environ.get("IBAN_CACHE_ENTRY_BYTES", 8 << 20)),
+    os.environ.get("IBAN_CACHE_SPILL_DIR") or None,
+    int(os.environ.get("IBAN_CACHE_SPILL_BYTES", 1 << 30))
+)
+DETERMINISTIC_CACHE_CONTROL = "public, max-age=86400"
+
+@functools.lru_cache(maxsize=None)
+def output_version() -> str:
+    digest = hashlib.sha256()
+    for path in (__file__, BANK_REGISTRY_PATH):
+        if path and os.path.exists(path):
+            with open(path, "rb") as f:
+                digest.update(f.read())
+    return digest.hexdigest()
+
+def request_etag(endpoint: str, params: dict) -> str:
+    payload = json.dumps([output_version(), endpoint, params], sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()[:32]
+
+def cached_response(etag: str, mimetype: str):
+    if request.if_none_match.contains_weak(etag):
+        METRICS.inc("iban_response_cache_total", (("result", "not_modified"),))
+        response = Response(status=304)
+    else:
+        body = RESPONSE_CACHE.get(etag)
+        if body is None:
+            return None
+        response = Response(body, mimetype=mimetype)
+    return with_etag(response, etag)
+
+def with_etag(response: Response, etag: str) -> Response:
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = DETERMINISTIC_CACHE_CONTROL
+    return response
+
+def iter_cached(etag: str, chunks):
+    parts = []
+    size = 0
+    for chunk in chunks:
+        yield chunk
+        if parts is not None:
+            size += len(chunk)
+            parts = parts if size <= RESPONSE_CACHE.max_entry_bytes else None
+            if parts is not None:
+                parts.append(chunk)
+    if parts is not None:
+        RESPONSE_CACHE.put(etag, "".join(parts).encode("ascii"))
 
 @app.route("/api/iban/gen")
 def generate_iban():
     country = request.args.get("code", "").upper()
     if country not in COUNTRY_GENERATORS:
-        return jsonify({
-            "error": "Unsupported country code",
-            "message": "Please provide a valid country code. Check supported countries at /api/iban/countries.",
-            "api_owner": "@ISmartCoder",
-            "updates_channel": "t.me/TheSmartDev"
-        }), 400
-    bban = COUNTRY_GENERATORS[country]["generator"]()
-    check_digits = calculate_check_digits(country, bban)
+        return unsupported_country_response()
+    try:
+        seed, stream, offset = seed_args(request.args)
+    except InvalidRequest as e:
+        return error_response(e.error, str(e))
+    if seed is None:
+        if IBAN_POOL is not None:
+            body = IBAN_POOL.pop(country)
+            if body is not None:
+                METRICS.inc("iban_generated_total", (("country", country),))
+                return json_response(body)
+        bban = COUNTRY_GENERATORS[country]["generator"]()
+    else:
+        etag = request_etag("gen", {"country": country, "seed": seed, "stream": stream, "offset": offset})
+        cached = cached_response(etag, "application/json")
+        if cached is not None:
+            return cached
+        bban = next(iter_bban_blocks(country, 1, seed, stream, offset))[0]
+    started = time.perf_counter()
+    check_digits = calculate_check_digits_fast(country, bban)
+    METRICS.observe("iban_check_digit_seconds", (("mode", "single"),), time.perf_counter() - started)
     iban = f"{country}{check_digits}{bban}"
     if len(iban) != COUNTRY_GENERATORS[country]["length"]:
-        logger.error(f"Generated IBAN length mismatch for {country}: expected {COUNTRY_GENERATORS[country]['length']}, got {len(iban)}")
-        return jsonify({
+        METRICS.inc("iban_length_mismatch_total", (("country", country),))
+        logger.error("Generated IBAN length mismatch for %s: expected %d, got %d", country, COUNTRY_GENERATORS[country]["length"], len(iban))
+        return json_response(json_body({
             "error": f"Generated IBAN length mismatch for {country}",
             "expected_length": COUNTRY_GENERATORS[country]["length"],
             "actual_length": len(iban),
             "api_owner": "@ISmartCoder",
             "updates_channel": "t.me/TheSmartDev"
-        }), 500
-    details = {"bban": bban, "check_digits": check_digits}
-    data = country_data[country]
-    offset = 0
-    if "bank_codes" in data:
-        details["bank_code"] = bban[:len(data["bank_codes"][0])]
-        offset = len(data["bank_codes"][0])
-    elif "bank_code_length" in data:
-        details["bank_code"] = bban[:data["bank_code_length"]]
-        offset = data["bank_code_length"]
-    if "branch_code_length" in data:
-        details["branch_code"] = bban[offset:offset+data["branch_code_length"]]
-        offset += data["branch_code_length"]
-    if "sort_code_length" in data:
-        details["sort_code"] = bban[offset:offset+data["sort_code_length"]]
-        offset += data["sort_code_length"]
-    if "prefix_length" in data:
-        details["prefix"] = bban[offset:offset+data["prefix_length"]]
-        offset += data["prefix_length"]
-    if "type_code_length" in data:
-        details["type_code"] = bban[offset:offset+data["type_code_length"]]
-        offset += data["type_code_length"]
-    if "identification_length" in data:
-        details["identification_number"] = bban[offset:offset+data["identification_length"]]
-        offset += data["identification_length"]
-    if "check_digits_length" in data:
-        details["check_digits"] = bban[offset:offset+data["check_digits_length"]]
-        offset += data["check_digits_length"]
-    if "key_length" in data:
-        details["key"] = bban[offset:offset+data["key_length"]]
-        offset += data["key_length"]
-    if "account_type_length" in data:
-        details["account_type"] = bban[offset:offset+data["account_type_length"]]
-        offset += data["account_type_length"]
-    if "owner_type_length" in data:
-        details["owner_type"] = bban[offset:offset+data["owner_type_length"]]
-        offset += data["owner_type_length"]
-    if "reserved_length" in data:
-        details["reserved"] = bban[offset:offset+data["reserved_length"]]
-        offset += data["reserved_length"]
-    if "account_length" in data:
-        details["account_number"] = bban[offset:offset+data["account_length"]]
-    if "check_char" in data and data["check_char"]:
-        details["cin"] = bban[0]
-    return jsonify({
+        }), 500)
+    METRICS.inc("iban_generated_total", (("country", country),))
+    body = generated_iban_body(country, bban, check_digits)
+    if seed is None:
+        return json_response(body)
+    RESPONSE_CACHE.put(etag, body)
+    return with_etag(json_response(body), etag)
+
+MAX_BULK_COUNT = int(os.environ.get("IBAN_MAX_BULK_COUNT", 10_000_000))
+MAX_WORKERS = int(os.environ.get("IBAN_MAX_WORKERS", os.cpu_count() or 1))
+SHARD_SIZE = 16 * SEED_BLOCK_SIZE
+BULK_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+    "text": "text/plain"
+}
+BULK_HEADERS = {
+    "ndjson": "",
+    "csv": "iban,country,check_digits,bban\n",
+    "text": ""
+}
+BULK_ROWS = {
+    "ndjson": '{{"iban":"{0}","country":"{1}","check_digits":"{2}","bban":"{3}"}}\n',
+    "csv": "{0},{1},{2},{3}\n",
+    "text": "{0}\n"
+}
+
+_process_pool = None
+_process_pool_lock = threading.Lock()
+
+def process_context():
+    if "forkserver" not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("spawn")
+    context = multiprocessing.get_context("forkserver")
+    context.set_forkserver_preload([__name__])
+    return context
+
+def process_pool() -> ProcessPoolExecutor:
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is None:
+            _process_pool = ProcessPoolExecutor(max_workers=MAX_WORKERS, mp_context=process_context())
+        return _process_pool
+
+def parse_countries(code: str):
+    if code == "ALL":
+        return list(COUNTRY_GENERATORS)
+    countries = list(dict.fromkeys(code.split(",")))
+    if not all(country in COUNTRY_GENERATORS for country in countries):
+        return None
+    return countries
+
+def format_rows(fmt: str, countries: list, check_digits_batch: list, bbans: list) -> str:
+    ibans = list(map("".join, zip(countries, check_digits_batch, bbans)))
+    if fmt == "text":
+        return "\n".join(ibans) + "\n" if ibans else ""
+    return "".join(map(BULK_ROWS[fmt].format, ibans, countries, check_digits_batch, bbans))
+
+def encode_bulk_rows(country: str, bbans: list, fmt: str, check_digits_batch=None) -> str:
+    if check_digits_batch is None:
+        started = time.perf_counter()
+        check_digits_batch = calculate_check_digits_batch(country, bbans)
+        METRICS.observe("iban_check_digit_seconds", (("mode", "batch"),), time.perf_counter() - started)
+    return format_rows(fmt, [country] * len(bbans), check_digits_batch, bbans)
+
+def generate_bulk_shard(country: str, count: int, fmt: str, seed=None, stream: int = 0, offset: int = 0) -> str:
+    return "".join(encode_bulk_rows(country, bbans, fmt) for bbans in iter_bban_blocks(country, count, seed, stream, offset))
+
+def bulk_shards(countries: list, count: int, offset: int = 0):
+    stop = offset + count
+    for country in countries:
+        start = offset
+        while start < stop:
+            end = min((start // SHARD_SIZE + 1) * SHARD_SIZE, stop)
+            yield country, start, end - start
+            start = end
+
+def iter_bulk_ibans(countries: list, count: int, fmt: str, seed=None, stream: int = 0, offset: int = 0, workers: int = 1, unique: bool = False, mix=None):
+    if BULK_HEADERS[fmt]:
+        yield BULK_HEADERS[fmt]
+    if mix is not None:
+        table = AliasTable(countries, [mix[country] for country in countries])
+        for rows in iter_mixed_blocks(table, count, seed, stream, offset):
+            mixed, check_digits_batch, bbans = zip(*rows)
+            yield format_rows(fmt, mixed, check_digits_batch, bbans)
+            for country, size in Counter(mixed).items():
+                METRICS.inc("iban_generated_total", (("country", country),), size)
+        return
+    if unique:
+        for country in countries:
+            for bbans in iter_unique_bban_blocks(country, count, seed, stream):
+                yield encode_bulk_rows(country, bbans, fmt)
+                METRICS.inc("iban_generated_total", (("country", country),), len(bbans))
+        return
+    if workers <= 1:
+        for country, start, size in bulk_shards(countries, count, offset):
+            for bbans in iter_bban_blocks(country, size, seed, stream, start):
+                yield encode_bulk_rows(country, bbans, fmt)
+                METRICS.inc("iban_generated_total", (("country", country),), len(bbans))
+        return
+    pool = process_pool()
+    pending = deque()
+    try:
+        for country, start, size in bulk_shards(countries, count, offset):
+            pending.append((country, size, pool.submit(generate_bulk_shard, country, size, fmt, seed, stream, start)))
+            if len(pending) >= 2 * workers:
+                country, size, future = pending.popleft()
+                yield future.result()
+                METRICS.inc("iban_generated_total", (("country", country),), size)
+        while pending:
+            country, size, future = pending.popleft()
+            yield future.result()
+            METRICS.inc("iban_generated_total", (("country", country),), size)
+    finally:
+        for _, _, future in pending:
+            future.cancel()
+
+def parse_mix(value: str) -> dict:
+    mix = {}
+    for item in value.split(","):
+        country, _, weight = item.partition(":")
+        if country not in COUNTRY_GENERATORS:
+            raise InvalidRequest("Unsupported country code", f"Unknown country {country!r} in mix. Check supported countries at /api/iban/countries.")
+        try:
+            mix[country] = float(weight)
+        except ValueError:
+            mix[country] = -1.0
+        if not 0 < mix[country] < float("inf"):
+            raise InvalidRequest("Invalid parameter", "mix must look like DE:40,FR:20,NL:10 with positive weights.")
+    return mix
+
+def parse_bulk_args(args) -> dict:
+    mix = parse_mix(args["mix"].upper()) if args.get("mix") else None
+    countries = list(mix) if mix is not None else parse_countries(args.get("code", "").upper())
+    if not countries:
+        raise InvalidRequest("Unsupported country code", "Please provide a valid country code. Check supported countries at /api/iban/countries.")
+    count = int_arg(args, "count", 1, 1, MAX_BULK_COUNT if mix is not None else MAX_BULK_COUNT // len(countries))
+    seed, stream, offset = seed_args(args)
+    workers = int_arg(args, "workers", 1, 1, MAX_WORKERS)
+    fmt = args.get("format", "ndjson").lower()
+    if fmt not in BULK_FORMATS:
+        raise InvalidRequest("Unsupported format", f"format must be one of: {', '.join(BULK_FORMATS)}.")
+    unique = args.get("unique", "false").lower() in ("1", "true", "yes")
+    if unique and mix is not None:
+        raise InvalidRequest("Invalid parameter", "mix cannot be combined with unique=true.")
+    if unique:
+        check_unique_args(countries, count, offset)
+    return {"countries": countries, "count": count, "fmt": fmt, "seed": seed, "stream": stream, "offset": offset, "workers": workers, "unique": unique, "mix": mix}
+
+def check_unique_args(countries: list, count: int, offset: int):
+    if offset:
+        raise InvalidRequest("Invalid parameter", "offset cannot be combined with unique=true.")
+    for country in countries:
+        limit = int(bban_keyspace(country) * UNIQUE_MAX_FILL)
+        if count > limit:
+            raise InvalidRequest("Keyspace too small", f"{country} can only produce {limit} unique IBANs per request, {count} requested.")
+
+@app.route("/api/iban/gen/bulk")
+def generate_iban_bulk():
+    try:
+        params = parse_bulk_args(request.args)
+    except InvalidRequest as e:
+        return error_response(e.error, str(e))
+    etag = bulk_etag(params)
+    mimetype = BULK_FORMATS[params["fmt"]]
+    if etag is None:
+        logger.info("Streaming %d IBANs for %s as %s with %d worker(s)", params["count"], params["countries"], params["fmt"], params["workers"])
+        return Response(stream_with_context(iter_bulk_ibans(**params)), mimetype=mimetype)
+    cached = cached_response(etag, mimetype)
+    if cached is not None:
+        return cached
+    logger.info("Streaming %d IBANs for %s as %s with %d worker(s)", params["count"], params["countries"], params["fmt"], params["workers"])
+    return with_etag(Response(stream_with_context(iter_cached(etag, iter_bulk_ibans(**params))), mimetype=mimetype), etag)
+
+def bulk_etag(params: dict):
+    if params["seed"] is None:
+        return None
+    return request_etag("bulk", {name: value for name, value in params.items() if name != "workers"})
+
+def iter_range_blocks(country: str, fixed: dict, start: int, stop: int, fmt: str):
+    if BULK_HEADERS[fmt]:
+        yield 0, BULK_HEADERS[fmt]
+    for bbans, check_digits in iter_enumerated_bbans(country, fixed, start, stop):
+        if not bbans:
+            continue
+        yield len(bbans), encode_bulk_rows(country, bbans, fmt, check_digits)
+        METRICS.inc("iban_generated_total", (("country", country),), len(bbans))
+
+def iter_range_ibans(country: str, fixed: dict, start: int, stop: int, fmt: str):
+    for _, chunk in iter_range_blocks(country, fixed, start, stop, fmt):
+        yield chunk
+
+def parse_range_args(args) -> dict:
+    country = args.get("code", "").upper()
+    if country not in COUNTRY_SPECS:
+        raise InvalidRequest("Unsupported country code", "Please provide a valid country code. Check supported countries at /api/iban/countries.")
+    try:
+        fixed = enumeration_fields(country, {name: value.upper() for name, value in args.items()})
+    except ValueError as e:
+        raise InvalidRequest("Invalid parameter", f"{e}.")
+    account_length = next(field.length for field in COUNTRY_SPECS[country].fields if field.name == ENUMERATED_FIELD)
+    start = int_arg(args, "start", 0, 0, 10 ** account_length - 1)
+    stop = int_arg(args, "stop", start + 1, start + 1, min(10 ** account_length, start + MAX_BULK_COUNT))
+    fmt = args.get("format", "ndjson").lower()
+    if fmt not in BULK_FORMATS:
+        raise InvalidRequest("Unsupported format", f"format must be one of: {', '.join(BULK_FORMATS)}.")
+    return {"country": country, "fixed": fixed, "start": start, "stop": stop, "fmt": fmt}
+
+@app.route("/api/iban/gen/range")
+def generate_iban_range():
+    try:
+        params = parse_range_args(request.args)
+    except InvalidRequest as e:
+        return error_response(e.error, str(e))
+    etag = request_etag("range", params)
+    mimetype = BULK_FORMATS[params["fmt"]]
+    cached = cached_response(etag, mimetype)
+    if cached is not None:
+        return cached
+    logger.info("Enumerating %s accounts %d..%d with %s as %s", params["country"], params["start"], params["stop"], params["fixed"], params["fmt"])
+    return with_etag(Response(stream_with_context(iter_cached(etag, iter_range_ibans(**params))), mimetype=mimetype), etag)
+
+class TokenBuckets:
+    def __init__(self, rate: float, burst: float, max_clients: int = 100_000, stripes: int = 64):
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self._stripes = [(threading.Lock(), OrderedDict()) for _ in range(stripes)]
+        self._stripe_capacity = max(max_clients // stripes, 1)
+
+    def spend(self, state, cost: float, now: float) -> tuple:
+        tokens, updated = state if state is not None else (self.burst, now)
+        tokens = min(self.burst, tokens + max(now - updated, 0.0) * self.rate)
+        needed = min(cost, self.burst)
+        if tokens < needed:
+            return (needed - tokens) / self.rate, tokens
+        return 0.0, tokens - cost
+
+    def take(self, key: str, cost: float) -> float:
+        now = time.monotonic()
+        lock, buckets = self._stripes[hash(key) % len(self._stripes)]
+        with lock:
+            wait, tokens = self.spend(buckets.pop(key, None), cost, now)
+            buckets[key] = (tokens, now)
+            if len(buckets) > self._stripe_capacity:
+                buckets.popitem(last=False)
+        return wait
+
+    def __len__(self) -> int:
+        return sum(len(buckets) for _, buckets in self._stripes)
+
+class SqliteTokenBuckets(TokenBuckets):
+    PRUNE_EVERY = 1024
+
+    def __init__(self, path: str, rate: float, burst: float):
+        super().__init__(rate, burst)
+        self.path = path
+        self.takes = 0
+        self._local = threading.local()
+
+    def connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("CREATE TABLE IF NOT EXISTS buckets (key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)")
+            connection.execute("CREATE INDEX IF NOT EXISTS buckets_updated ON buckets (updated)")
+            self._local.connection = connection
+        return connection
+
+    def take(self, key: str, cost: float) -> float:
+        now = time.time()
+        connection = self.connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            state = connection.execute("SELECT tokens, updated FROM buckets WHERE key = ?", (key,)).fetchone()
+            wait, tokens = self.spend(state, cost, now)
+            connection.execute("INSERT OR REPLACE INTO buckets (key, tokens, updated) VALUES (?, ?, ?)", (key, tokens, now))
+            self.takes += 1
+            if self.takes % self.PRUNE_EVERY == 0:
+                connection.execute("DELETE FROM buckets WHERE tokens + (? - updated) * ? >= ?", (now, self.rate, self.burst))
+                connection.execute(
+                    "DELETE FROM buckets WHERE key IN (SELECT key FROM buckets ORDER BY updated DESC LIMIT -1 OFFSET ?)",
+                    (self.max_clients,)
+                )
+        finally:
+            connection.execute("COMMIT")
+        return wait
+
+class AdmissionGate:
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.active = 0
+        self._lock = threading.Lock()
+
+    def enter(self) -> bool:
+        with self._lock:
+            if self.active >= self.limit:
+                return False
+            self.active += 1
+            return True
+
+    def leave(self):
+        with self._lock:
+            self.active -= 1
+
+RATE_LIMIT_ROWS = float(os.environ.get("IBAN_RATE_LIMIT_ROWS", 1_000_000))
+RATE_LIMIT_BURST = float(os.environ.get("IBAN_RATE_LIMIT_BURST", MAX_BULK_COUNT))
+RATE_LIMIT_DB = os.environ.get("IBAN_RATE_LIMIT_DB") or None
+TRUST_FORWARDED_FOR = os.environ.get("IBAN_TRUST_FORWARDED_FOR") == "1"
+API_KEYS = frozenset(key.strip() for key in os.environ.get("IBAN_API_KEYS", "").split(",") if key.strip())
+if RATE_LIMIT_ROWS <= 0:
+    RATE_LIMITER = None
+elif RATE_LIMIT_DB:
+    RATE_LIMITER = SqliteTokenBuckets(RATE_LIMIT_DB, RATE_LIMIT_ROWS, RATE_LIMIT_BURST)
+else:
+    RATE_LIMITER = TokenBuckets(RATE_LIMIT_ROWS, RATE_LIMIT_BURST)
+# The bulk job cap is counted in each process: a gunicorn deployment runs up to workers * IBAN_MAX_BULK_JOBS at once.
+MAX_BULK_JOBS = int(os.environ.get("IBAN_MAX_BULK_JOBS", 4))
+BULK_JOBS = AdmissionGate(MAX_BULK_JOBS) if MAX_BULK_JOBS > 0 else None
+BULK_JOB_RETRY_AFTER = 1.0
+BULK_LINE_BYTES = 24
+BULK_UPLOAD_ROUTES = {"/api/iban/validate/bulk", "/api/iban/parse/bulk"}
+LENGTH_REQUIRED = ("Length required", "Send bulk uploads with a Content-Length header; chunked uploads cannot be rate limited.")
+REJECTIONS = {
+    "rate": ("Rate limit exceeded", "Too many rows requested by this client. Retry after the number of seconds in the Retry-After header."),
+    "concurrency": ("Server busy", "Too many bulk jobs are running. Retry after the number of seconds in the Retry-After header.")
+}
+
+def client_key(api_key, remote_addr, forwarded_for=None) -> str:
+    if api_key in API_KEYS:
+        return "key:" + hashlib.sha256(api_key.encode("utf-8", "replace")).hexdigest()[:32]
+    if TRUST_FORWARDED_FOR and forwarded_for:
+        return "ip:" + forwarded_for.split(",")[0].strip()
+    return f"ip:{remote_addr}"
+
+def bulk_cost(params: dict) -> int:
+    return params["count"] if params["mix"] is not None else params["count"] * len(params["countries"])
+
+def request_cost(endpoint: str, args, content_length=None) -> int:
+    try:
+        if endpoint == "/api/iban/gen/bulk":
+            return bulk_cost(parse_bulk_args(args))
+        if endpoint == "/api/iban/gen/range":
+            params = parse_range_args(args)
+            return params["stop"] - params["start"]
+    except InvalidRequest:
+        pass
+    if endpoint in BULK_UPLOAD_ROUTES and content_length:
+        return max(content_length // BULK_LINE_BYTES, 1)
+    return 1
+
+def unmetered_upload(endpoint: str, content_length, transfer_encoding) -> bool:
+    if RATE_LIMITER is None or endpoint not in BULK_UPLOAD_ROUTES or content_length is not None or not transfer_encoding:
+        return False
+    METRICS.inc("iban_rejected_total", (("reason", "length"),))
+    return True
+
+def admit(client: str, cost: int, job: bool):
+    if job and BULK_JOBS is not None and not BULK_JOBS.enter():
+        METRICS.inc("iban_rejected_total", (("reason", "concurrency"),))
+        return "concurrency", BULK_JOB_RETRY_AFTER
+    wait = RATE_LIMITER.take(client, cost) if RATE_LIMITER is not None else 0.0
+    if wait:
+        if job and BULK_JOBS is not None:
+            BULK_JOBS.leave()
+        METRICS.inc("iban_rejected_total", (("reason", "rate"),))
+        return "rate", wait
+    return None
+
+def retry_after(wait: float) -> str:
+    return str(max(math.ceil(wait), 1))
+
+def leave_bulk_job():
+    if BULK_JOBS is not None:
+        BULK_JOBS.leave()
+
+BODY_READ_SIZE = 1 << 16
+VERDICT_CHUNK_SIZE = 1000
+
+MAX_IBAN_LENGTH = 34
+MAX_LINE_BYTES = 128
+
+def split_lines(pending: bytes, chunk: bytes) -> tuple:
+    lines = (pending + chunk).split(b"\n")
+    return lines, lines.pop()[:MAX_LINE_BYTES + 1]
+
+def iter_body_lines(stream):
+    pending = b""
+    while True:
+        chunk = stream.read(BODY_READ_SIZE)
+        if not chunk:
+            break
+        lines, pending = split_lines(pending, chunk)
+        yield from lines
+    if pending:
+        yield pending
+
+def check_line(raw: bytes):
+    if len(raw) > MAX_LINE_BYTES:
+        iban = raw[:MAX_IBAN_LENGTH].decode("utf-8", "replace").strip().upper()
+        return iban, iban[:2], f"Line too long: an IBAN has at most {MAX_IBAN_LENGTH} characters"
+    raw = raw.decode("utf-8", "replace").strip()
+    return check_iban(raw) if raw else None
+
+def format_verdict(line_number: int, iban: str, country: str, error) -> str:
+    if error is None:
+        return f'{{"line":{line_number},"iban":"{iban}","valid":true}}\n'
+    return f'{{"line":{line_number},"iban":{json.dumps(iban)},"valid":false,"error":"{error}"}}\n'
+
+def format_parsed(line_number: int, iban: str, country: str, error) -> str:
+    result = {"line": line_number, "iban": iban, "country": country, "valid": error is None, "details": iban_details(iban, country)}
+    if error is not None:
+        result["error"] = error
+    return dumps(result).decode() + "\n"
+
+def country_label(country: str) -> str:
+    if not country:
+        return "none"
+    return country if country in COUNTRY_GENERATORS else "other"
+
+def record_validation(country: str, error):
+    METRICS.inc("iban_validated_total", (("country", country_label(country)), ("valid", "false" if error else "true")))
+
+def iter_checked_lines(stream):
+    for line_number, raw in enumerate(iter_body_lines(stream), 1):
+        checked = check_line(raw)
+        if checked is not None:
+            yield (line_number, *checked)
+
+def iter_bulk_verdicts(stream, render=format_verdict):
+    lines = []
+    for line_number, iban, country, error in iter_checked_lines(stream):
+        record_validation(country, error)
+        lines.append(render(line_number, iban, country, error))
+        if len(lines) == VERDICT_CHUNK_SIZE:
+            yield "".join(lines)
+            lines = []
+    if lines:
+        yield "".join(lines)
+
+@app.route("/api/iban/validate")
+def validate_iban():
+    raw = request.args.get("iban", "")
+    if not raw.strip():
+        return error_response("Missing IBAN", "Please provide an IBAN to validate, e.g., /api/iban/validate?iban=DE89370400440532013000.")
+    iban, country, error = check_iban(raw)
+    record_validation(country, error)
+    result = {
         "iban": iban,
         "country": country,
-        "valid": True,
+        "valid": error is None,
         "length": len(iban),
-        "details": details,
         "api_owner": "@ISmartCoder",
         "updates_channel": "t.me/TheSmartDev"
-    })
+    }
+    if error is not None:
+        result["error"] = error
+    return json_response(json_body(result))
+
+@app.route("/api/iban/validate/bulk", methods=["POST"])
+def validate_iban_bulk():
+    logger.info("Streaming bulk IBAN validation")
+    return Response(stream_with_context(iter_bulk_verdicts(request.stream)), mimetype="application/x-ndjson")
+
+@app.route("/metrics")
+def metrics():
+    samples = []
+    if IBAN_POOL is not None:
+        for country, stats in IBAN_POOL.stats().items():
+            labels = (("country", country),)
+            samples.append(("iban_pool_size", labels, stats["size"]))
+            samples.append(("iban_pool_hits_total", labels, stats["hits"]))
+            samples.append(("iban_pool_misses_total", labels, stats["misses"]))
+    if BULK_JOBS is not None:
+        samples.append(("iban_bulk_jobs_active", (), BULK_JOBS.active))
+    return Response(METRICS.render(samples), mimetype="text/plain; version=0.0.4")
+
+def request_country(args) -> str:
+    code = (args.get("code") or args.get("iban", "").strip()[:2]).upper()
+    if code == "ALL" or "," in code:
+        return "multi"
+    return country_label(code)
+
+@app.route("/api/iban/parse")
+def parse_iban():
+    raw = request.args.get("iban", "")
+    if not raw.strip():
+        return error_response("Missing IBAN", "Please provide an IBAN to parse, e.g., /api/iban/parse?iban=DE89370400440532013000.")
+    iban, country, error = check_iban(raw)
+    result = {
+        "iban": iban,
+        "country": country,
+        "valid": error is None,
+        "length": len(iban),
+        "details": iban_details(iban, country),
+        "api_owner": "@ISmartCoder",
+        "updates_channel": "t.me/TheSmartDev"
+    }
+    if error is not None:
+        result["error"] = error
+    return json_response(json_body(result))
+
+@app.route("/api/iban/parse/bulk", methods=["POST"])
+def parse_iban_bulk():
+    logger.info("Streaming bulk IBAN parsing")
+    return Response(stream_with_context(iter_bulk_verdicts(request.stream, format_parsed)), mimetype="application/x-ndjson")
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+BULK_JOB_ROUTES = {"/api/iban/gen/bulk", "/api/iban/gen/range", "/api/iban/validate/bulk", "/api/iban/parse/bulk"}
+
+@app.before_request
+def admit_request():
+    endpoint = request.url_rule.rule if request.url_rule is not None else None
+    if endpoint is None or not endpoint.startswith("/api/"):
+        return None
+    client = client_key(request.headers.get("X-API-Key"), request.remote_addr, request.headers.get("X-Forwarded-For"))
+    if unmetered_upload(endpoint, request.content_length, request.headers.get("Transfer-Encoding")):
+        return error_response(*LENGTH_REQUIRED, 411)
+    job = endpoint in BULK_JOB_ROUTES
+    rejection = admit(client, request_cost(endpoint, request.args, request.content_length), job)
+    if rejection is not None:
+        reason, wait = rejection
+        response = error_response(*REJECTIONS[reason], 429)
+        response.headers["Retry-After"] = retry_after(wait)
+        return response
+    g.bulk_job = job
+    return None
+
+@app.after_request
+def release_bulk_job(response):
+    if g.pop("bulk_job", False):
+        response.call_on_close(leave_bulk_job)
+    return response
+
+def record_request(endpoint: str, country: str, status: int, started):
+    METRICS.inc("iban_http_requests_total", (("endpoint", endpoint), ("country", country), ("status", status)))
+    if started is not None:
+        METRICS.observe("iban_http_request_duration_seconds", (("endpoint", endpoint), ("country", country)), time.perf_counter() - started)
+
+def log_request(method: str, path: str, query: str, status: int, started, remote_addr):
+    if status >= 500:
+        level = logging.ERROR
+    elif status >= 400:
+        level = logging.WARNING
+    else:
+        level = logging.INFO
+        if ACCESS_LOG_SAMPLE_RATE < 1.0 and random.random() >= ACCESS_LOG_SAMPLE_RATE:
+            return
+    if access_logger.isEnabledFor(level):
+        access_logger.log(level, "%s %s %d", method, path, status, extra={"fields": {
+            "method": method,
+            "path": path,
+            "query": query,
+            "status": status,
+            "duration_ms": round((time.perf_counter() - started) * 1000, 3) if started is not None else None,
+            "remote_addr": remote_addr,
+            "sampled": status < 400 and ACCESS_LOG_SAMPLE_RATE < 1.0
+        }})
+
+@app.after_request
+def record_request_metrics(response):
+    endpoint = request.url_rule.rule if request.url_rule is not None else "unmatched"
+    record_request(endpoint, request_country(request.args), response.status_code, g.get("request_started"))
+    return response
+
+@app.after_request
+def log_access(response):
+    log_request(request.method, request.path, request.query_string.decode("latin-1"), response.status_code, g.get("request_started"), request.remote_addr)
+    return response
 
 @app.errorhandler(404)
 def not_found(error):
-    return jsonify({
-        "error": "Sorry, You're Lost In Wrong Endpoint",
-        "message": "Please use /api/iban/gen?code=<code> to generate an IBAN or /api/iban/countries to see supported countries.",
-        "api_owner": "@ISmartCoder",
-        "updates_channel": "t.me/TheSmartDev"
-    }), 404
+    return error_response(
+        "Sorry, You're Lost In Wrong Endpoint",
+        "Please use /api/iban/gen?code=<code> to generate an IBAN or /api/iban/countries to see supported countries.",
+        404
+    )
 
 if __name__ == "__main__":
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    app.run(debug=os.environ.get("FLASK_DEBUG") == "1", host='0.0.0.0', port=int(os.environ.get("PORT", 5000)))
@@ -0,0 +1,168 @@
+import asyncio
+import functools
+import time
+from urllib.parse import parse_qsl
+
+from asgiref.wsgi import WsgiToAsgi
+
+from api import (
+    BULK_FORMATS, DETERMINISTIC_CACHE_CONTROL, LENGTH_REQUIRED, REJECTIONS, RESPONSE_CACHE, InvalidRequest, admit, app as flask_app,
+    bulk_etag, check_line, client_key, error_body, format_parsed, format_verdict, iter_bulk_ibans, iter_cached,
+    iter_range_ibans, leave_bulk_job, log_request, parse_bulk_args, parse_range_args, record_request, record_validation,
+    request_cost, request_country, request_etag, retry_after, split_lines, unmetered_upload
+)
+
+flask_asgi = WsgiToAsgi(flask_app)
+
+async def send_json(send, status: int, body: bytes, headers=()):
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode()), *headers]
+    })
+    await send({"type": "http.response.body", "body": body})
+
+async def start_stream(send, mimetype: str, etag=None, status: int = 200):
+    headers = [(b"content-type", mimetype.encode())]
+    if etag is not None:
+        headers += [(b"etag", f'"{etag}"'.encode()), (b"cache-control", DETERMINISTIC_CACHE_CONTROL.encode())]
+    await send({"type": "http.response.start", "status": status, "headers": headers})
+
+def if_none_match(scope) -> bytes:
+    return b",".join(value for name, value in scope["headers"] if name == b"if-none-match")
+
+async def wait_for_disconnect(receive):
+    while (await receive())["type"] != "http.disconnect":
+        pass
+
+async def stream_generated(scope, receive, send, mimetype: str, etag, chunks):
+    loop = asyncio.get_running_loop()
+    if etag is not None:
+        if etag.encode() in if_none_match(scope):
+            await start_stream(send, mimetype, etag, 304)
+            return await send({"type": "http.response.body", "body": b""})
+        body = await loop.run_in_executor(None, RESPONSE_CACHE.get, etag)
+        if body is not None:
+            await start_stream(send, mimetype, etag)
+            return await send({"type": "http.response.body", "body": body})
+        chunks = iter_cached(etag, chunks)
+    await start_stream(send, mimetype, etag)
+    disconnect = asyncio.ensure_future(wait_for_disconnect(receive))
+    try:
+        while True:
+            chunk = loop.run_in_executor(None, next, chunks, None)
+            await asyncio.wait((chunk, disconnect), return_when=asyncio.FIRST_COMPLETED)
+            if disconnect.done():
+                await chunk
+                return
+            chunk = chunk.result()
+            if chunk is None:
+                break
+            await send({"type": "http.response.body", "body": chunk.encode(), "more_body": True})
+    finally:
+        disconnect.cancel()
+        chunks.close()
+    await send({"type": "http.response.body", "body": b""})
+
+async def generate_bulk(scope, receive, send):
+    args = dict(parse_qsl(scope["query_string"].decode("latin-1")))
+    try:
+        params = parse_bulk_args(args)
+    except InvalidRequest as e:
+        return await send_json(send, 400, error_body(e.error, str(e)))
+    await stream_generated(scope, receive, send, BULK_FORMATS[params["fmt"]], bulk_etag(params), iter_bulk_ibans(**params))
+
+async def generate_range(scope, receive, send):
+    args = dict(parse_qsl(scope["query_string"].decode("latin-1")))
+    try:
+        params = parse_range_args(args)
+    except InvalidRequest as e:
+        return await send_json(send, 400, error_body(e.error, str(e)))
+    await stream_generated(scope, receive, send, BULK_FORMATS[params["fmt"]], request_etag("range", params), iter_range_ibans(**params))
+
+def check_lines(lines: list, line_number: int, render=format_verdict) -> str:
+    verdicts = []
+    for raw in lines:
+        line_number += 1
+        checked = check_line(raw)
+        if checked is not None:
+            iban, country, error = checked
+            record_validation(country, error)
+            verdicts.append(render(line_number, iban, country, error))
+    return "".join(verdicts)
+
+async def validate_bulk(scope, receive, send, render=format_verdict):
+    loop = asyncio.get_running_loop()
+    await start_stream(send, "application/x-ndjson")
+    pending = b""
+    line_number = 0
+    more_body = True
+    while more_body:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            return
+        more_body = message.get("more_body", False)
+        lines, pending = split_lines(pending, message.get("body", b""))
+        if not more_body:
+            lines.append(pending)
+        verdicts = await loop.run_in_executor(None, check_lines, lines, line_number, render)
+        line_number += len(lines)
+        if verdicts:
+            await send({"type": "http.response.body", "body": verdicts.encode(), "more_body": True})
+    await send({"type": "http.response.body", "body": b""})
+
+async def lifespan(scope, receive, send):
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+def header(scope, name: bytes):
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+async def observed_send(send, scope, args: dict, started: float, message):
+    if message["type"] == "http.response.start":
+        status = message["status"]
+        record_request(scope["path"], request_country(args), status, started)
+        log_request(scope["method"], scope["path"], scope["query_string"].decode("latin-1"), status, started, (scope.get("client") or (None,))[0])
+    await send(message)
+
+async def admit_bulk_job(scope, receive, send, handler):
+    started = time.perf_counter()
+    client = client_key(header(scope, b"x-api-key"), (scope.get("client") or ("unknown",))[0], header(scope, b"x-forwarded-for"))
+    args = dict(parse_qsl(scope["query_string"].decode("latin-1")))
+    send = functools.partial(observed_send, send, scope, args, started)
+    content_length = header(scope, b"content-length")
+    content_length = int(content_length) if content_length and content_length.isdigit() else None
+    if unmetered_upload(scope["path"], content_length, header(scope, b"transfer-encoding")):
+        return await send_json(send, 411, error_body(*LENGTH_REQUIRED))
+    cost = request_cost(scope["path"], args, content_length)
+    rejection = admit(client, cost, True)
+    if rejection is not None:
+        reason, wait = rejection
+        return await send_json(send, 429, error_body(*REJECTIONS[reason]), [(b"retry-after", retry_after(wait).encode())])
+    try:
+        await handler(scope, receive, send)
+    finally:
+        leave_bulk_job()
+
+STREAMING_ROUTES = {
+    ("GET", "/api/iban/gen/bulk"): generate_bulk,
+    ("GET", "/api/iban/gen/range"): generate_range,
+    ("POST", "/api/iban/validate/bulk"): validate_bulk,
+    ("POST", "/api/iban/parse/bulk"): functools.partial(validate_bulk, render=format_parsed)
+}
+
+async def app(scope, receive, send):
+    if scope["type"] == "lifespan":
+        return await lifespan(scope, receive, send)
+    handler = STREAMING_ROUTES.get((scope.get("method"), scope.get("path")))
+    if handler is None:
+        return await flask_asgi(scope, receive, send)
+    await admit_bulk_job(scope, receive, send, handler)
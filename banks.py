@@ -0,0 +1,101 @@
+import bisect
+import csv
+import mmap
+import os
+import struct
+import tempfile
+
+MAGIC = b"BANKIDX1"
+HEADER = struct.Struct("<8sII")
+KEY_WIDTH = 14
+RECORD = struct.Struct(f"<{KEY_WIDTH}s11sfIH")
+
+def record_key(country: str, bank_code: str) -> bytes:
+    return (country + bank_code).encode("ascii").ljust(KEY_WIDTH)
+
+def compile_registry(csv_path: str, index_path: str) -> int:
+    records = []
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            country = row["country"].strip().upper()
+            bank_code = row["bank_code"].strip().upper()
+            if len(country) != 2 or not 0 < len(bank_code) <= KEY_WIDTH - 2:
+                raise ValueError(f"{csv_path}: invalid bank {country!r} {bank_code!r}")
+            weight = float(row.get("weight") or 1)
+            records.append((record_key(country, bank_code), row.get("bic", "").strip().upper(), weight, row["name"].strip()))
+    records.sort()
+    names = bytearray()
+    packed = bytearray(HEADER.size + RECORD.size * len(records))
+    for index, (key, bic, weight, name) in enumerate(records):
+        encoded = name.encode("utf-8")
+        RECORD.pack_into(packed, HEADER.size + index * RECORD.size, key, bic.encode("ascii"), weight, len(names), len(encoded))
+        names += encoded
+    HEADER.pack_into(packed, 0, MAGIC, len(records), len(packed))
+    descriptor, temporary = tempfile.mkstemp(prefix=os.path.basename(index_path) + ".", suffix=".tmp", dir=os.path.dirname(os.path.abspath(index_path)))
+    try:
+        with os.fdopen(descriptor, "wb") as f:
+            f.write(packed + names)
+        os.replace(temporary, index_path)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+    return len(records)
+
+class RecordKeys:
+    def __init__(self, buffer, count: int):
+        self.buffer = buffer
+        self.count = count
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, index: int) -> bytes:
+        position = HEADER.size + index * RECORD.size
+        return self.buffer[position:position + KEY_WIDTH]
+
+class BankRegistry:
+    def __init__(self, index_path: str):
+        with open(index_path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.count, self._names = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{index_path} is not a bank registry index")
+        self._keys = RecordKeys(self._mmap, self.count)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _record(self, index: int) -> tuple:
+        key, bic, weight, name_offset, name_length = RECORD.unpack_from(self._mmap, HEADER.size + index * RECORD.size)
+        start = self._names + name_offset
+        return key.decode("ascii").rstrip(), bic.decode("ascii"), weight, self._mmap[start:start + name_length].decode("utf-8")
+
+    def lookup(self, country: str, bank_code: str):
+        if not (country + bank_code).isascii() or len(country) + len(bank_code) > KEY_WIDTH:
+            return None
+        key = record_key(country, bank_code)
+        index = bisect.bisect_left(self._keys, key)
+        if index == self.count or self._keys[index] != key:
+            return None
+        _, bic, _, name = self._record(index)
+        return {"name": name, "bic": bic}
+
+    def country_banks(self, country: str) -> list:
+        prefix = country.encode("ascii")
+        start = bisect.bisect_left(self._keys, prefix)
+        stop = bisect.bisect_left(self._keys, prefix + b"\xff")
+        return [(key[2:], weight) for key, _, weight, _ in map(self._record, range(start, stop))]
+
+def index_path_for(csv_path: str) -> str:
+    directory = os.path.dirname(os.path.abspath(csv_path))
+    name = os.path.basename(csv_path) + ".idx"
+    if not os.access(directory, os.W_OK):
+        directory = tempfile.gettempdir()
+    return os.path.join(directory, name)
+
+def load_registry(csv_path: str, index_path=None) -> BankRegistry:
+    index_path = index_path or index_path_for(csv_path)
+    if not os.path.exists(index_path) or os.path.getmtime(index_path) < os.path.getmtime(csv_path):
+        compile_registry(csv_path, index_path)
+    return BankRegistry(index_path)
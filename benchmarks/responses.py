@@ -0,0 +1,86 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import api
+from flask import jsonify
+
+def legacy_generated_iban_body(country: str, bban: str, check_digits: str) -> bytes:
+    details = {"bban": bban, "check_digits": check_digits}
+    details.update(api.parse_bban(country, bban))
+    api.add_bank_details(country, details)
+    iban = f"{country}{check_digits}{bban}"
+    return jsonify({
+        "iban": iban,
+        "country": country,
+        "valid": True,
+        "length": len(iban),
+        "details": details,
+        "api_owner": "@ISmartCoder",
+        "updates_channel": "t.me/TheSmartDev"
+    }).get_data()
+
+def legacy_error_body() -> bytes:
+    return jsonify({
+        "error": "Unsupported country code",
+        "message": "Please provide a valid country code. Check supported countries at /api/iban/countries.",
+        "api_owner": "@ISmartCoder",
+        "updates_channel": "t.me/TheSmartDev"
+    }).get_data()
+
+def templated_error_body() -> bytes:
+    return api.error_body("Unsupported country code", "Please provide a valid country code. Check supported countries at /api/iban/countries.")
+
+def measure(render, inputs: list) -> dict:
+    start = time.perf_counter()
+    size = 0
+    for args in inputs:
+        size += len(render(*args))
+    elapsed = time.perf_counter() - start
+    return {"requests_per_sec": round(len(inputs) / elapsed), "bytes_per_sec": round(size / elapsed)}
+
+def measure_endpoint(client, url: str, requests: int) -> dict:
+    start = time.perf_counter()
+    size = 0
+    for _ in range(requests):
+        size += len(client.get(url).data)
+    elapsed = time.perf_counter() - start
+    return {"requests_per_sec": round(requests / elapsed), "bytes_per_sec": round(size / elapsed)}
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare jsonify against the pre-encoded response templates.")
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--code", default="DE")
+    args = parser.parse_args()
+    country = args.code.upper()
+    bbans = api.generate_bban_batch(country, args.requests)
+    inputs = list(zip([country] * len(bbans), bbans, api.calculate_check_digits_batch(country, bbans)))
+    with api.app.test_request_context():
+        if any(legacy_generated_iban_body(*item) != api.generated_iban_body(*item) for item in inputs[:100]):
+            print("warning: templated body differs from jsonify output", file=sys.stderr)
+        results = {
+            "json_backend": "orjson" if api.orjson is not None else "json",
+            "generate_body": {
+                "jsonify": measure(legacy_generated_iban_body, inputs),
+                "template": measure(api.generated_iban_body, inputs)
+            },
+            "error_body": {
+                "jsonify": measure(legacy_error_body, [()] * args.requests),
+                "template": measure(templated_error_body, [()] * args.requests)
+            }
+        }
+    client = api.app.test_client()
+    api.access_logger.disabled = True
+    results["endpoint"] = {
+        "/api/iban/gen": measure_endpoint(client, f"/api/iban/gen?code={country}", args.requests // 10),
+        "/": measure_endpoint(client, "/", args.requests // 10)
+    }
+    print(json.dumps(results, indent=2))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
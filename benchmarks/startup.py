@@ -0,0 +1,39 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBES = {
+    "import_api_ms": "import time; start = time.perf_counter(); import api; print(time.perf_counter() - start)",
+    "import_api_own_ms": "import flask, time; start = time.perf_counter(); import api; print(time.perf_counter() - start)"
+}
+
+def measure(statement: str, runs: int) -> list:
+    timings = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, "-c", statement], cwd=ROOT, capture_output=True, text=True, check=True).stdout
+        timings.append(float(output.strip().splitlines()[-1]) * 1000)
+    return timings
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure cold import time of the api module in fresh interpreters.")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--max-own-ms", type=float, default=None, help="fail if importing api after flask takes longer than this (median)")
+    args = parser.parse_args()
+    results = {"runs": args.runs}
+    for name, statement in PROBES.items():
+        timings = measure(statement, args.runs)
+        results[name] = round(statistics.median(timings), 2)
+        results[name.replace("_ms", "_min_ms")] = round(min(timings), 2)
+    print(json.dumps(results, indent=2))
+    if args.max_own_ms is not None and results["import_api_own_ms"] > args.max_own_ms:
+        print(f"import api took {results['import_api_own_ms']} ms on top of flask, limit is {args.max_own_ms} ms", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,148 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import api
+
+def best_rate(run, operations: int, repeat: int) -> float:
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return operations / best
+
+def bench_generation(size: int, repeat: int) -> dict:
+    results = {}
+    for country, entry in api.COUNTRY_GENERATORS.items():
+        generator = entry["generator"]
+        results[f"generate.single.{country}"] = best_rate(lambda: [generator() for _ in range(size // 10)], size // 10, repeat)
+        results[f"generate.batch.{country}"] = best_rate(lambda: api.generate_bban_batch(country, size), size, repeat)
+    return results
+
+def bench_check_digits(size: int, repeat: int) -> dict:
+    samples = []
+    for country in api.COUNTRY_GENERATORS:
+        samples.extend((country, bban) for bban in api.generate_bban_batch(country, max(size // len(api.COUNTRY_GENERATORS), 1)))
+    batches = {country: api.generate_bban_batch(country, size) for country in ("DE", "FR", "GB", "IT")}
+    results = {
+        "check_digits.reference": best_rate(lambda: [api.calculate_check_digits(country, bban) for country, bban in samples], len(samples), repeat),
+        "check_digits.fast": best_rate(lambda: [api.calculate_check_digits_fast(country, bban) for country, bban in samples], len(samples), repeat)
+    }
+    for country, bbans in batches.items():
+        results[f"check_digits.batch.{country}"] = best_rate(lambda: api.calculate_check_digits_batch(country, bbans), len(bbans), repeat)
+    return results
+
+def bench_details(size: int, repeat: int) -> dict:
+    samples = []
+    for country in api.COUNTRY_GENERATORS:
+        bbans = api.generate_bban_batch(country, max(size // len(api.COUNTRY_GENERATORS), 1))
+        samples.extend(zip([country] * len(bbans), bbans, api.calculate_check_digits_batch(country, bbans)))
+    ibans = [f"{country}{check_digits}{bban}" for country, bban, check_digits in samples]
+    return {
+        "details.parse_bban": best_rate(lambda: [api.parse_bban(country, bban) for country, bban, _ in samples], len(samples), repeat),
+        "details.response_body": best_rate(lambda: [api.generated_iban_body(*sample) for sample in samples], len(samples), repeat),
+        "details.check_iban": best_rate(lambda: [api.check_iban(iban) for iban in ibans], len(ibans), repeat),
+        "details.iban_details": best_rate(lambda: [api.iban_details(iban, iban[:2]) for iban in ibans], len(ibans), repeat)
+    }
+
+def fetch(client, method: str, url: str, **kwargs) -> bytes:
+    with client.open(url, method=method, **kwargs) as response:
+        if response.status_code >= 400:
+            raise RuntimeError(f"{method} {url} returned {response.status_code}")
+        return response.data
+
+def bench_endpoints(size: int, repeat: int) -> dict:
+    client = api.app.test_client()
+    api.access_logger.disabled = True
+    api.RATE_LIMITER = None
+    api.BULK_JOBS = None
+    requests = max(size // 20, 1)
+    urls = {
+        "http.home": "/",
+        "http.countries": "/api/iban/countries",
+        "http.gen.DE": "/api/iban/gen?code=DE",
+        "http.gen.IT": "/api/iban/gen?code=IT",
+        "http.gen.seeded": "/api/iban/gen?code=FR&seed=42",
+        "http.validate": "/api/iban/validate?iban=DE89370400440532013000",
+        "http.parse": "/api/iban/parse?iban=DE89370400440532013000",
+        "http.not_found": "/missing"
+    }
+    results = {name: best_rate(lambda: [client.get(url).data for _ in range(requests)], requests, repeat) for name, url in urls.items()}
+    rows = size * 10
+    results["http.gen_bulk_rows"] = best_rate(lambda: fetch(client, "GET", f"/api/iban/gen/bulk?code=DE&count={rows}"), rows, repeat)
+    body = "".join(f"{iban}\n" for iban in api.generate_bulk_shard("DE", rows, "text").split())
+    results["http.validate_bulk_rows"] = best_rate(lambda: fetch(client, "POST", "/api/iban/validate/bulk", data=body), rows, repeat)
+    return results
+
+GROUPS = {
+    "generation": bench_generation,
+    "check_digits": bench_check_digits,
+    "details": bench_details,
+    "endpoints": bench_endpoints
+}
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    regressions = []
+    for name, rate in sorted(results.items()):
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        change = rate / previous - 1
+        print(f"{name:40} {previous:14.0f} {rate:14.0f} {change:+8.1%}", file=sys.stderr)
+        if change < -threshold:
+            regressions.append(name)
+    return regressions
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark generation, check digits, response construction and HTTP endpoints.")
+    parser.add_argument("--size", type=int, default=5000, help="operations per measurement")
+    parser.add_argument("--repeat", type=int, default=3, help="keep the best of this many runs")
+    parser.add_argument("--group", action="append", choices=list(GROUPS), help="run only these groups")
+    parser.add_argument("-o", "--output", default=None, help="write results JSON here instead of stdout")
+    parser.add_argument("--compare", default=None, help="baseline results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.15, help="fail when a benchmark is this much slower than the baseline")
+    args = parser.parse_args()
+    results = {}
+    for name in args.group or GROUPS:
+        results.update(GROUPS[name](args.size, args.repeat))
+    report = {
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "json_backend": "orjson" if api.orjson is not None else "json",
+        "size": args.size,
+        "repeat": args.repeat,
+        "unit": "operations_per_sec",
+        "results": {name: round(rate, 1) for name, rate in results.items()}
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(report["results"], baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} benchmark(s) slower than {args.threshold:.0%}: {', '.join(regressions)}", file=sys.stderr)
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,188 @@
+import argparse
+import sys
+import time
+
+import ibanfile
+
+from api import (
+    BULK_FORMATS, COUNTRY_GENERATORS, InvalidRequest, check_unique_args, enumeration_fields, format_verdict,
+    iter_bulk_ibans, iter_checked_lines, iter_range_blocks, parse_countries, parse_mix, self_test_check_digits
+)
+
+WRITE_BUFFER_SIZE = 1 << 20
+
+def open_output(path: str):
+    if path == "-":
+        return open(sys.stdout.fileno(), "wb", buffering=WRITE_BUFFER_SIZE, closefd=False)
+    return open(path, "wb", buffering=WRITE_BUFFER_SIZE)
+
+def open_input(path: str):
+    if path == "-":
+        return open(sys.stdin.fileno(), "rb", buffering=WRITE_BUFFER_SIZE, closefd=False)
+    return open(path, "rb", buffering=WRITE_BUFFER_SIZE)
+
+def at_least(minimum: int):
+    def parse(value: str) -> int:
+        number = int(value)
+        if number < minimum:
+            raise argparse.ArgumentTypeError(f"must be at least {minimum}, got {number}")
+        return number
+    return parse
+
+def write_blocks(out, blocks) -> tuple:
+    rows = size = 0
+    for count, chunk in blocks:
+        data = chunk.encode("ascii")
+        out.write(data)
+        rows += count
+        size += len(data)
+    return rows, size
+
+def report(action: str, rows: int, size: int, elapsed: float):
+    elapsed = max(elapsed, 1e-9)
+    print(
+        f"{action} {rows} rows ({size / 1e6:.1f} MB) in {elapsed:.2f}s: "
+        f"{rows / elapsed:,.0f} rows/sec, {size / 1e6 / elapsed:.1f} MB/sec",
+        file=sys.stderr
+    )
+
+def generate(args) -> int:
+    mix = None
+    if args.mix:
+        try:
+            mix = parse_mix(args.mix.upper())
+        except InvalidRequest as e:
+            print(f"{e.error}: {e}", file=sys.stderr)
+            return 2
+        if args.unique or args.format == "bin":
+            print("--mix cannot be combined with --unique or --format bin", file=sys.stderr)
+            return 2
+        countries = list(mix)
+        rows = args.count
+    else:
+        countries = parse_countries(args.code.upper())
+        if not countries:
+            print(f"Unsupported country code: {args.code}. Supported: {', '.join(COUNTRY_GENERATORS)}, or ALL.", file=sys.stderr)
+            return 2
+        rows = args.count * len(countries)
+    if args.unique:
+        try:
+            check_unique_args(countries, args.count, args.offset)
+        except InvalidRequest as e:
+            print(f"{e.error}: {e}", file=sys.stderr)
+            return 2
+    start = time.perf_counter()
+    if args.format == "bin":
+        if args.output == "-":
+            print("--format bin needs an --output path", file=sys.stderr)
+            return 2
+        size = ibanfile.write_iban_file(args.output, countries, args.count, args.seed, args.stream, args.offset, args.workers, args.unique)
+        report("Generated", rows, size, time.perf_counter() - start)
+        return 0
+    with open_output(args.output) as out:
+        _, size = write_blocks(out, ((0, chunk) for chunk in iter_bulk_ibans(countries, args.count, args.format, args.seed, args.stream, args.offset, args.workers, args.unique, mix)))
+    report("Generated", rows, size, time.perf_counter() - start)
+    return 0
+
+def enumerate_range(args) -> int:
+    country = args.code.upper()
+    if country not in COUNTRY_GENERATORS:
+        print(f"Unsupported country code: {args.code}. Supported: {', '.join(COUNTRY_GENERATORS)}.", file=sys.stderr)
+        return 2
+    try:
+        fixed = enumeration_fields(country, {name: value.upper() for name, value in (field.split("=", 1) for field in args.field)})
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+    if args.stop <= args.start:
+        print(f"--stop must be greater than --start ({args.start})", file=sys.stderr)
+        return 2
+    start = time.perf_counter()
+    with open_output(args.output) as out:
+        rows, size = write_blocks(out, iter_range_blocks(country, fixed, args.start, args.stop, args.format))
+    report("Enumerated", rows, size, time.perf_counter() - start)
+    return 0
+
+def validate(args) -> int:
+    start = time.perf_counter()
+    rows = invalid = 0
+    with open_input(args.input) as source, open_output(args.output) as out:
+        for line_number, iban, country, error in iter_checked_lines(source):
+            rows += 1
+            if error is not None:
+                invalid += 1
+            elif args.invalid_only:
+                continue
+            out.write(format_verdict(line_number, iban, country, error).encode())
+        size = source.tell() if source.seekable() else 0
+    report("Validated", rows, size, time.perf_counter() - start)
+    print(f"{rows - invalid} valid, {invalid} invalid", file=sys.stderr)
+    return 1 if invalid else 0
+
+def read(args) -> int:
+    try:
+        source = ibanfile.IBANFile(args.input)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+    with source, open_output(args.output) as out:
+        stop = len(source) if args.stop is None else min(args.stop, len(source))
+        for index in range(args.start, stop):
+            out.write(source.view(index))
+            out.write(b"\n")
+    return 0
+
+def selftest(args) -> int:
+    checked = self_test_check_digits(args.samples)
+    print(f"Check digit kernels agree with calculate_check_digits on {checked} BBANs", file=sys.stderr)
+    return 0
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Generate and validate IBANs offline, without going through HTTP.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    gen = commands.add_parser("generate", help="write generated IBANs to a file or stdout")
+    countries = gen.add_mutually_exclusive_group(required=True)
+    countries.add_argument("--code", help="country code, comma-separated list, or ALL")
+    countries.add_argument("--mix", help="weighted country mix such as DE:40,FR:20,NL:10")
+    gen.add_argument("--count", type=at_least(1), required=True, help="rows per country, or in total with --mix")
+    gen.add_argument("--format", choices=[*BULK_FORMATS, "bin"], default="text")
+    gen.add_argument("--output", "-o", default="-", help="output path, - for stdout")
+    gen.add_argument("--seed", type=at_least(0), default=None)
+    gen.add_argument("--stream", type=at_least(0), default=0)
+    gen.add_argument("--offset", type=at_least(0), default=0)
+    gen.add_argument("--workers", type=at_least(1), default=1, help="processes to shard generation across")
+    gen.add_argument("--unique", action="store_true", help="guarantee no duplicate IBANs (runs in a single process)")
+    gen.set_defaults(handler=generate)
+
+    rng = commands.add_parser("range", help="enumerate account numbers in order for fixed bank details")
+    rng.add_argument("--code", required=True, help="country code")
+    rng.add_argument("--start", type=at_least(0), default=0, help="first account number")
+    rng.add_argument("--stop", type=at_least(1), required=True, help="account number after the last one")
+    rng.add_argument("--field", action="append", default=[], help="fixed field value, e.g. bank_code=37050198 (repeatable)")
+    rng.add_argument("--format", choices=list(BULK_FORMATS), default="text")
+    rng.add_argument("--output", "-o", default="-", help="output path, - for stdout")
+    rng.set_defaults(handler=enumerate_range)
+
+    val = commands.add_parser("validate", help="validate one IBAN per line and write NDJSON verdicts")
+    val.add_argument("input", help="input path, - for stdin")
+    val.add_argument("--output", "-o", default="-", help="output path, - for stdout")
+    val.add_argument("--invalid-only", action="store_true", help="only write verdicts for invalid IBANs")
+    val.set_defaults(handler=validate)
+
+    dump = commands.add_parser("read", help="print IBANs from a --format bin file as text")
+    dump.add_argument("input", help="binary IBAN file")
+    dump.add_argument("--start", type=at_least(0), default=0, help="index of the first IBAN to print")
+    dump.add_argument("--stop", type=at_least(0), default=None, help="index after the last IBAN to print")
+    dump.add_argument("--output", "-o", default="-", help="output path, - for stdout")
+    dump.set_defaults(handler=read)
+
+    test = commands.add_parser("selftest", help="check the fast check digit kernels against the reference implementation")
+    test.add_argument("--samples", type=at_least(1), default=200)
+    test.set_defaults(handler=selftest)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+# Generated by scripts/generate_country_names.py from pycountry; do not edit by hand.
+COUNTRY_NAMES = {
+    "AL": "Albania",
+    "AD": "Andorra",
+    "AT": "Austria",
+    "AZ": "Azerbaijan",
+    "BH": "Bahrain",
+    "BE": "Belgium",
+    "BA": "Bosnia and Herzegovina",
+    "BR": "Brazil",
+    "CR": "Costa Rica",
+    "HR": "Croatia",
+    "CY": "Cyprus",
+    "CZ": "Czechia",
+    "DK": "Denmark",
+    "DO": "Dominican Republic",
+    "EG": "Egypt",
+    "SV": "El Salvador",
+    "EE": "Estonia",
+    "FO": "Faroe Islands",
+    "FI": "Finland",
+    "FR": "France",
+    "GE": "Georgia",
+    "DE": "Germany",
+    "GI": "Gibraltar",
+    "GR": "Greece",
+    "GL": "Greenland",
+    "GT": "Guatemala",
+    "HU": "Hungary",
+    "IS": "Iceland",
+    "IE": "Ireland",
+    "IL": "Israel",
+    "IT": "Italy",
+    "JO": "Jordan",
+    "KZ": "Kazakhstan",
+    "XK": "Unknown",
+    "KW": "Kuwait",
+    "LV": "Latvia",
+    "LB": "Lebanon",
+    "LI": "Liechtenstein",
+    "LT": "Lithuania",
+    "LU": "Luxembourg",
+    "MK": "North Macedonia",
+    "MT": "Malta",
+    "MR": "Mauritania",
+    "MC": "Monaco",
+    "ME": "Montenegro",
+    "NL": "Netherlands",
+    "NO": "Norway",
+    "PK": "Pakistan",
+    "PL": "Poland",
+    "PT": "Portugal",
+    "QA": "Qatar",
+    "MD": "Moldova, Republic of",
+    "RO": "Romania",
+    "SM": "San Marino",
+    "SA": "Saudi Arabia",
+    "RS": "Serbia",
+    "SK": "Slovakia",
+    "SI": "Slovenia",
+    "ES": "Spain",
+    "SE": "Sweden",
+    "CH": "Switzerland",
+    "TL": "Timor-Leste",
+    "TR": "T\u00fcrkiye",
+    "UA": "Ukraine",
+    "AE": "United Arab Emirates",
+    "GB": "United Kingdom",
+    "VA": "Holy See (Vatican City State)",
+    "VG": "Virgin Islands, British"
+}
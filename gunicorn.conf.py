@@ -0,0 +1,17 @@
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+# Each worker may also start up to IBAN_MAX_WORKERS generation processes (default: CPU count) for
+# bulk requests with workers > 1, so the host can run workers * (IBAN_MAX_WORKERS + 1) processes.
+# IBAN_MAX_BULK_JOBS also applies per worker, so up to workers * IBAN_MAX_BULK_JOBS bulk jobs can stream at once.
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.environ.get("GUNICORN_THREADS", 4))
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "gthread")
+keepalive = int(os.environ.get("GUNICORN_KEEPALIVE", 5))
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 120))
+graceful_timeout = int(os.environ.get("GUNICORN_GRACEFUL_TIMEOUT", 30))
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", 0))
+max_requests_jitter = int(os.environ.get("GUNICORN_MAX_REQUESTS_JITTER", 0))
+accesslog = os.environ.get("GUNICORN_ACCESS_LOG")
+errorlog = os.environ.get("GUNICORN_ERROR_LOG", "-")
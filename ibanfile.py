@@ -0,0 +1,120 @@
+import bisect
+import mmap
+import struct
+
+from api import COUNTRY_SPECS, iter_bulk_ibans
+
+MAGIC = b"IBANBIN1"
+HEADER = struct.Struct("<8sII")
+SECTION = struct.Struct("<2sH4xQQ")
+
+def file_layout(countries: list, count: int) -> tuple:
+    offset = HEADER.size + SECTION.size * len(countries)
+    sections = []
+    for country in countries:
+        width = COUNTRY_SPECS[country].length
+        sections.append((country, width, count, offset))
+        offset += width * count
+    return sections, offset
+
+def write_iban_file(path: str, countries: list, count: int, seed=None, stream: int = 0, offset: int = 0, workers: int = 1, unique: bool = False) -> int:
+    sections, size = file_layout(countries, count)
+    with open(path, "w+b") as f:
+        f.truncate(size)
+        with mmap.mmap(f.fileno(), size) as mm:
+            HEADER.pack_into(mm, 0, MAGIC, len(sections), count * len(sections))
+            for index, (country, width, rows, start) in enumerate(sections):
+                SECTION.pack_into(mm, HEADER.size + index * SECTION.size, country.encode("ascii"), width, rows, start)
+            position = sections[0][3]
+            for chunk in iter_bulk_ibans(countries, count, "text", seed, stream, offset, workers, unique):
+                data = chunk.replace("\n", "").encode("ascii")
+                mm[position:position + len(data)] = data
+                position += len(data)
+            if position != size:
+                raise RuntimeError(f"Wrote {position} of {size} bytes to {path}")
+            mm.flush()
+    return size
+
+class IBANFile:
+    def __init__(self, path: str):
+        self._file = open(path, "rb")
+        self.buffer = None
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self.buffer = memoryview(self._mmap)
+            self._read_sections(path)
+        except BaseException:
+            self.close()
+            raise
+
+    def _read_sections(self, path: str):
+        size = len(self._mmap)
+        if size < HEADER.size:
+            raise ValueError(f"{path} is not an IBAN binary file")
+        magic, section_count, total_rows = HEADER.unpack_from(self.buffer, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not an IBAN binary file")
+        data_start = HEADER.size + section_count * SECTION.size
+        if data_start > size:
+            raise ValueError(f"{path} is truncated: section table needs {data_start} bytes, file has {size}")
+        self.sections = []
+        self._starts = []
+        total = 0
+        for index in range(section_count):
+            country, width, rows, start = SECTION.unpack_from(self.buffer, HEADER.size + index * SECTION.size)
+            country = country.decode("ascii", "replace")
+            if width == 0 or start < data_start or start + rows * width > size:
+                raise ValueError(f"{path} section {country} ({rows} rows of {width} bytes at {start}) does not fit in {size} bytes")
+            self.sections.append((country, width, rows, start))
+            self._starts.append(total)
+            total += rows
+        if total != total_rows:
+            raise ValueError(f"{path} header lists {total_rows} rows but its sections hold {total}")
+        self.count = total
+
+    def __len__(self) -> int:
+        return self.count
+
+    def view(self, index: int) -> memoryview:
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError("IBAN index out of range")
+        section = bisect.bisect_right(self._starts, index) - 1
+        _, width, _, start = self.sections[section]
+        position = start + (index - self._starts[section]) * width
+        return self.buffer[position:position + width]
+
+    def __getitem__(self, index: int) -> str:
+        return str(self.view(index), "ascii")
+
+    def __iter__(self):
+        for country, width, rows, start in self.sections:
+            for position in range(start, start + rows * width, width):
+                yield str(self.buffer[position:position + width], "ascii")
+
+    def section(self, country: str) -> memoryview:
+        for code, width, rows, start in self.sections:
+            if code == country:
+                return self.buffer[start:start + rows * width]
+        raise KeyError(country)
+
+    def close(self):
+        try:
+            if getattr(self, "buffer", None) is not None:
+                self.buffer.release()
+                self.buffer = None
+            try:
+                if getattr(self, "_mmap", None) is not None:
+                    self._mmap.close()
+            except BufferError:
+                # Views from view()/section() are still alive; the mapping is unmapped once they are released.
+                pass
+        finally:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
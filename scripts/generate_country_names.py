@@ -0,0 +1,29 @@
+import json
+import os
+import sys
+
+import pycountry
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from api import country_data
+
+def render() -> str:
+    lines = [
+        "# Generated by scripts/generate_country_names.py from pycountry; do not edit by hand.",
+        "COUNTRY_NAMES = {"
+    ]
+    entries = []
+    for code in country_data:
+        country = pycountry.countries.get(alpha_2=code)
+        entries.append(f"    {json.dumps(code)}: {json.dumps(country.name if country else 'Unknown')}")
+    lines.append(",\n".join(entries))
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+if __name__ == "__main__":
+    path = os.path.join(ROOT, "country_names.py")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(render())
+    print(f"Wrote {len(country_data)} country names to {path}")
@@ -0,0 +1,31 @@
+import asyncio
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import asgi
+
+def call_asgi_app(method: str, path: str, body: bytes = b"", headers=()) -> tuple:
+    messages = []
+    requests = [{"type": "http.request", "body": body, "more_body": False}]
+
+    async def receive():
+        if requests:
+            return requests.pop()
+        await asyncio.Event().wait()
+
+    async def send(message):
+        messages.append(message)
+
+    path, _, query = path.partition("?")
+    scope = {"type": "http", "method": method, "path": path, "query_string": query.encode(), "headers": list(headers), "client": ("127.0.0.1", 1)}
+    asyncio.run(asgi.app(scope, receive, send))
+    return messages[0]["status"], b"".join(message.get("body", b"") for message in messages[1:])
+
+@pytest.fixture
+def call_asgi():
+    return call_asgi_app
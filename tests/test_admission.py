@@ -0,0 +1,28 @@
+import io
+import json
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import api
+
+BODY = b"DE89370400440532013000\n"
+
+def test_chunked_bulk_upload_needs_length():
+    assert api.RATE_LIMITER is not None
+    with api.app.test_client().post("/api/iban/validate/bulk", input_stream=io.BytesIO(BODY), headers={"Transfer-Encoding": "chunked"}) as response:
+        assert response.status_code == 411
+        assert response.json["error"] == "Length required"
+
+def test_chunked_bulk_upload_needs_length_over_asgi(call_asgi):
+    status, body = call_asgi("POST", "/api/iban/parse/bulk", BODY, [(b"transfer-encoding", b"chunked")])
+    assert status == 411
+    assert json.loads(body)["error"] == "Length required"
+
+def test_bulk_upload_with_length_is_charged_per_line(call_asgi):
+    assert api.request_cost("/api/iban/validate/bulk", {}, api.BULK_LINE_BYTES * 100) == 100
+    status, body = call_asgi("POST", "/api/iban/validate/bulk", BODY, [(b"content-length", str(len(BODY)).encode())])
+    assert status == 200
+    assert json.loads(body)["valid"] is True
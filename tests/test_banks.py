@@ -0,0 +1,33 @@
+import json
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import api
+
+NON_ASCII_BANK_CODE = "DE89É70400440532013000"
+
+def test_lookup_ignores_codes_that_cannot_be_keys():
+    registry = api.bank_registry()
+    assert registry is not None
+    assert registry.lookup("DE", "37040044")["bic"] == "COBADEFFXXX"
+    assert registry.lookup("DE", "É7040044") is None
+    assert registry.lookup("DE", "1" * 20) is None
+
+def test_parse_skips_enrichment_for_invalid_bank_code():
+    with api.app.test_client().get("/api/iban/parse", query_string={"iban": NON_ASCII_BANK_CODE}) as response:
+        assert response.status_code == 200
+        assert response.json["error"] == "Invalid characters in bank_code"
+        assert "bank_name" not in response.json["details"]
+
+def test_bulk_parse_streams_past_invalid_bank_code(call_asgi):
+    body = f"{NON_ASCII_BANK_CODE}\nDE89370400440532013000\n".encode()
+    with api.app.test_client().post("/api/iban/parse/bulk", data=body) as response:
+        flask_lines = [json.loads(line) for line in response.data.splitlines()]
+    status, asgi_body = call_asgi("POST", "/api/iban/parse/bulk", body)
+    assert status == 200
+    for lines in (flask_lines, [json.loads(line) for line in asgi_body.splitlines()]):
+        assert [line["valid"] for line in lines] == [False, True]
+        assert lines[1]["details"]["bic"] == "COBADEFFXXX"
@@ -0,0 +1,79 @@
+import os
+import random
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import api
+
+PUBLISHED_EXAMPLES = {
+    "BA": "BA391290079401028494",
+    "BE": "BE68539007547034",
+    "DK": "DK5000400440116243",
+    "ES": "ES9121000418450200051332",
+    "FI": "FI2112345600000785",
+    "FR": "FR1420041010050500013M02606",
+    "HU": "HU42117730161111101800000000",
+    "IT": "IT60X0542811101000000123456",
+    "MC": "MC5811222000010123456789030",
+    "ME": "ME25505000012345678951",
+    "MK": "MK07250120000058984",
+    "NO": "NO9386011117947",
+    "PT": "PT50000201231234567890154",
+    "RS": "RS35260005601001611379",
+    "SI": "SI56263300012039086",
+    "SM": "SM86U0322509800000000270100"
+}
+
+def with_check_digits(country: str, bban: str) -> str:
+    return f"{country}{api.calculate_check_digits(country, bban)}{bban}"
+
+def test_every_rule_has_a_published_example():
+    assert set(api.COUNTRY_CHECKSUMS) == set(PUBLISHED_EXAMPLES)
+
+@pytest.mark.parametrize("country, iban", sorted(PUBLISHED_EXAMPLES.items()))
+def test_published_example_is_valid(country, iban):
+    assert api.check_iban(iban) == (iban, country, None)
+
+@pytest.mark.parametrize("country, iban", sorted(PUBLISHED_EXAMPLES.items()))
+def test_rule_reproduces_published_digits(country, iban):
+    parsed = api.parse_bban(country, iban[4:])
+    columns = {name: [value] for name, value in parsed.items()}
+    for field in api.COUNTRY_SPECS[country].fields:
+        if field.checksum is None or not field.verify:
+            continue
+        assert field.checksum(columns) == [parsed[field.name]], field.name
+
+@pytest.mark.parametrize("country, iban", sorted(PUBLISHED_EXAMPLES.items()))
+def test_wrong_national_digits_are_rejected(country, iban):
+    parsed = api.parse_bban(country, iban[4:])
+    assert "".join(parsed.values()) == iban[4:]
+    checked = 0
+    for field in api.COUNTRY_SPECS[country].fields:
+        if field.checksum is None or not field.verify:
+            continue
+        value = parsed[field.name]
+        wrong = "".join(api.NUMERIC[(api.NUMERIC.index(c) + 1) % 10] if c in api.NUMERIC else chr(ord(c) % 26 + 65) for c in value)
+        bban = "".join(wrong if name == field.name else parsed[name] for name in parsed)
+        wrong_iban, _, error = api.check_iban(with_check_digits(country, bban))
+        assert error == f"Invalid {field.name.replace('_', ' ')}", wrong_iban
+        checked += 1
+    assert checked or country == "DK"
+
+def test_generated_dk_accounts_satisfy_mod11():
+    for bban in api.generate_bban_batch("DK", 2000, random.Random(1)):
+        weighted = sum(int(digit) * weight for digit, weight in zip(bban[4:], (4, 3, 2, 7, 6, 5, 4, 3, 2, 1)))
+        assert weighted % 11 == 0, bban
+
+@pytest.mark.parametrize("country", sorted(api.COUNTRY_GENERATORS))
+def test_generated_ibans_round_trip(country):
+    rng = random.Random(country)
+    bbans = api.generate_bban_batch(country, 500, rng)
+    assert api.calculate_check_digits_batch(country, bbans) == [api.calculate_check_digits(country, bban) for bban in bbans]
+    for bban in bbans:
+        iban = with_check_digits(country, bban)
+        assert api.check_iban(iban) == (iban, country, None)
+        assert len(iban) == api.COUNTRY_SPECS[country].length
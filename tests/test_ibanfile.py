@@ -0,0 +1,37 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import ibanfile
+
+def write_sample(path) -> bytes:
+    ibanfile.write_iban_file(str(path), ["DE", "NO"], 5, seed=1)
+    return path.read_bytes()
+
+def test_round_trip(tmp_path):
+    path = tmp_path / "ibans.bin"
+    write_sample(path)
+    with ibanfile.IBANFile(str(path)) as data:
+        assert len(data) == 10
+        assert [iban[:2] for iban in data] == ["DE"] * 5 + ["NO"] * 5
+        assert data[-1] == list(data)[-1]
+
+@pytest.mark.parametrize("size", [0, ibanfile.HEADER.size - 1, ibanfile.HEADER.size + ibanfile.SECTION.size, -1])
+def test_truncated_file_is_rejected(tmp_path, size):
+    path = tmp_path / "ibans.bin"
+    data = write_sample(path)
+    path.write_bytes(data[:size])
+    with pytest.raises(ValueError):
+        ibanfile.IBANFile(str(path))
+
+def test_row_total_must_match_sections(tmp_path):
+    path = tmp_path / "ibans.bin"
+    data = bytearray(write_sample(path))
+    ibanfile.HEADER.pack_into(data, 0, ibanfile.MAGIC, 2, 11)
+    path.write_bytes(bytes(data))
+    with pytest.raises(ValueError, match="11 rows"):
+        ibanfile.IBANFile(str(path))
@@ -0,0 +1,30 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import api
+
+def test_range_without_valid_accounts_is_empty():
+    with api.app.test_client().get("/api/iban/gen/range?code=NO&bank_code=8601&start=6&stop=7&format=text") as response:
+        assert response.status_code == 200
+        assert response.data == b""
+
+def test_range_blocks_count_rows_written():
+    blocks = list(api.iter_range_blocks("NO", {"bank_code": "8601"}, 0, 15, "csv"))
+    body = "".join(chunk for _, chunk in blocks)
+    rows = body.splitlines()[1:]
+    assert sum(count for count, _ in blocks) == len(rows) == 14
+    assert all(api.check_iban(row.split(",")[0])[2] is None for row in rows)
+
+def test_asgi_range_matches_flask(call_asgi):
+    path = "/api/iban/gen/range?code=NO&bank_code=8601&start=0&stop=15&format=csv"
+    status, body = call_asgi("GET", path)
+    with api.app.test_client().get(path) as response:
+        etag = response.headers["ETag"]
+        assert (status, body) == (200, response.data)
+    status, body = call_asgi("GET", path, headers=[(b"if-none-match", etag.encode())])
+    assert (status, body) == (304, b"")
+    status, body = call_asgi("GET", "/api/iban/gen/range?code=XX")
+    assert status == 400